@@ -4,22 +4,26 @@ import csv
 import logging
 from datetime import datetime
 from core.utils import Utils
+from core.telemetry_schema import TelemetrySchema
+from core.session_journal import SessionJournal
 
 
 class CsvHandler:
-    def __init__(self):
+    CSV_NAME = 'telemetry_data.csv'
+
+    def __init__(self, resume=False):
         self.logger = logging.getLogger(
             'Lazarus_Ground_Station.csv_handler')
         self.session_dir = Utils.session_path
         self.filename = os.path.join(self.session_dir,
-                                     'telemetry_data.csv')
+                                     self.CSV_NAME)
         self.file = None
         self.writer = None
-        self.header = ['timestamp', 'velocity', 'pitch',
-                       'roll', 'status',
-                       'altitude', 'latitude', 'longitude',
-                       'len', 'rssi', 'snr']
-        self.create_file_with_header()
+        self.header = TelemetrySchema.get().csv_header
+        if resume and os.path.exists(self.filename):
+            self.open_for_append()
+        else:
+            self.create_file_with_header()
 
     def create_file_with_header(self):
         try:
@@ -39,6 +43,61 @@ class CsvHandler:
             self.logger.error(
                 f"Failed to create CSV file: {e}")
 
+    def open_for_append(self):
+        try:
+            self.file = open(self.filename, 'a', newline='',
+                             encoding='utf-8')
+            self.writer = csv.writer(self.file,
+                                     delimiter=';')
+            self.logger.info(
+                f"Wznowiono zapis do pliku CSV: {self.filename}")
+        except Exception as e:
+            self.logger.error(
+                f"Failed to reopen CSV file: {e}")
+
+    @staticmethod
+    def repair(journal_records, tail):
+        # Po awarii: obcina niepełny ostatni wiersz i wyrównuje liczbę
+        # wierszy CSV do liczby rekordów dziennika - nadmiarowe wiersze są
+        # usuwane, brakujące odtwarzane z rekordów dziennika
+        logger = logging.getLogger('Lazarus_Ground_Station.csv_handler')
+        filename = os.path.join(Utils.session_path, CsvHandler.CSV_NAME)
+        if not os.path.exists(filename):
+            return
+
+        with open(filename, 'r+b') as f:
+            content = f.read()
+            end = content.rfind(b'\n') + 1
+            if end < len(content):
+                logger.warning(
+                    f"Obcięto niepełny ostatni wiersz CSV: "
+                    f"{len(content) - end} bajtów")
+            rows = max(content.count(b'\n', 0, end) - 1, 0)
+            extra = rows - journal_records
+            for _ in range(max(extra, 0)):
+                end = content.rfind(b'\n', 0, end - 1) + 1
+            if extra > 0:
+                logger.warning(
+                    f"Usunięto {extra} wierszy CSV bez odpowiednika w dzienniku")
+            f.truncate(end)
+
+        missing = journal_records - rows
+        if missing <= 0:
+            return
+        if missing > len(tail):
+            # CSV utracił również wiersze sprzed punktu kontrolnego -
+            # jedyny przypadek, w którym czytany jest cały dziennik
+            with open(os.path.join(Utils.session_path,
+                                   SessionJournal.JOURNAL_NAME), 'rb') as f:
+                tail, _ = SessionJournal.decode_frames(f.read())
+            missing = min(missing, len(tail))
+        header = TelemetrySchema.get().csv_header
+        with open(filename, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, delimiter=';')
+            for record in tail[len(tail) - missing:]:
+                writer.writerow([record.get(key, '') for key in header])
+        logger.warning(f"Odtworzono {missing} wierszy CSV z dziennika sesji")
+
     def write_row(self, data_dict):
         if not self.writer:
             self.logger.error("CSV writer not initialized")
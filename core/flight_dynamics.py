@@ -0,0 +1,134 @@
+import math
+import time
+import logging
+
+
+class FlightDynamics:
+    # Filtr alfa-beta-gamma dla wysokości: szacuje wysokość, prędkość
+    # pionową i przyspieszenie w O(1) na pakiet, bez przeglądania historii.
+    EARTH_RADIUS = 6371000.0
+    # Pakiety bliżej niż MIN_DT łączone są z kolejnym krokiem filtru -
+    # przy dt -> 0 człon residual / dt^2 rozbiega się
+    MIN_DT = 0.02
+    FIELDS = ['vertical_speed', 'vertical_acceleration',
+              'smoothed_velocity', 'max_altitude',
+              'apogee_time', 'distance', 'bearing']
+
+    def __init__(self, alpha=0.5, beta=0.1, gamma=0.01,
+                 velocity_alpha=0.3):
+        self.logger = logging.getLogger(
+            'Lazarus_Ground_Station.flight_dynamics')
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.velocity_alpha = velocity_alpha
+        self.reset()
+
+    def reset(self):
+        self.last_time = None
+        self.altitude = None
+        self.vertical_speed = 0.0
+        self.vertical_acceleration = 0.0
+        self.smoothed_velocity = None
+        self.max_altitude = None
+        self.apogee_time = None
+        self.launch_lat = None
+        self.launch_lon = None
+        self.distance = 0.0
+        self.bearing = 0.0
+        self.start_time = None
+
+    def restore(self, state):
+        # Wznowienie sesji: punkt startu i apogeum z odtworzonej historii,
+        # filtr wysokości startuje od nowa od pierwszego pakietu
+        self.reset()
+        self.launch_lat = state.get('launch_lat')
+        self.launch_lon = state.get('launch_lon')
+        self.max_altitude = state.get('max_altitude')
+        self.apogee_time = state.get('apogee_time')
+        self.start_time = time.monotonic() - state.get('elapsed', 0.0)
+        self.logger.info(f"Odtworzono stan dynamiki lotu: {state}")
+
+    def update(self, telemetry, timestamp=None):
+        now = time.monotonic() if timestamp is None else timestamp
+        if self.start_time is None:
+            self.start_time = now
+
+        if self._update_altitude(telemetry['altitude'], now):
+            self.last_time = now
+        self._update_velocity(telemetry['velocity'])
+        self._update_position(telemetry['latitude'],
+                              telemetry['longitude'])
+
+        return {
+            'vertical_speed': self.vertical_speed,
+            'vertical_acceleration': self.vertical_acceleration,
+            'smoothed_velocity': self.smoothed_velocity,
+            'max_altitude': self.max_altitude,
+            'apogee_time': self.apogee_time,
+            'distance': self.distance,
+            'bearing': self.bearing
+        }
+
+    def _update_altitude(self, altitude, now):
+        if self.altitude is None:
+            self.altitude = altitude
+            if self.max_altitude is None or altitude > self.max_altitude:
+                self.max_altitude = altitude
+                self.apogee_time = now - self.start_time
+            return True
+
+        dt = now - self.last_time
+        if dt < self.MIN_DT:
+            return False
+
+        predicted_alt = (self.altitude + self.vertical_speed * dt
+                         + 0.5 * self.vertical_acceleration * dt * dt)
+        predicted_speed = (self.vertical_speed
+                           + self.vertical_acceleration * dt)
+        residual = altitude - predicted_alt
+
+        self.altitude = predicted_alt + self.alpha * residual
+        self.vertical_speed = predicted_speed + self.beta * residual / dt
+        self.vertical_acceleration += (2.0 * self.gamma * residual
+                                       / (dt * dt))
+
+        if self.altitude > self.max_altitude:
+            self.max_altitude = self.altitude
+            self.apogee_time = now - self.start_time
+        return True
+
+    def _update_velocity(self, velocity):
+        if self.smoothed_velocity is None:
+            self.smoothed_velocity = velocity
+        else:
+            self.smoothed_velocity += self.velocity_alpha * (
+                velocity - self.smoothed_velocity)
+
+    def _update_position(self, lat, lon):
+        # Brak fixa GPS raportowany jest jako 0.0/0.0
+        if lat == 0.0 and lon == 0.0:
+            return
+
+        if self.launch_lat is None:
+            self.launch_lat = lat
+            self.launch_lon = lon
+            self.logger.info(
+                f"Zapisano punkt startu: {lat:.6f} {lon:.6f}")
+            return
+
+        phi1 = math.radians(self.launch_lat)
+        phi2 = math.radians(lat)
+        d_phi = phi2 - phi1
+        d_lambda = math.radians(lon - self.launch_lon)
+
+        a = (math.sin(d_phi / 2) ** 2
+             + math.cos(phi1) * math.cos(phi2)
+             * math.sin(d_lambda / 2) ** 2)
+        self.distance = 2 * self.EARTH_RADIUS * math.asin(
+            min(1.0, math.sqrt(a)))
+
+        y = math.sin(d_lambda) * math.cos(phi2)
+        x = (math.cos(phi1) * math.sin(phi2)
+             - math.sin(phi1) * math.cos(phi2) * math.cos(d_lambda))
+        self.bearing = (math.degrees(math.atan2(y, x)) + 360.0) % 360.0
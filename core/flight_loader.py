@@ -0,0 +1,231 @@
+# flight_loader.py
+import os
+import glob
+import logging
+from itertools import islice
+import numpy as np
+from core.telemetry_schema import TelemetrySchema
+from core.utils import Utils
+
+
+class FlightLoader:
+    CSV_NAME = 'telemetry_data.csv'
+    CACHE_NAME = 'telemetry_data.npz'
+    STATUS_EVENTS = {
+        'calibration': 0,
+        'start': 1,
+        'engine': 2,
+        'apogee': 3,
+        'recovery': 4,
+        'landing': 5
+    }
+
+    logger = logging.getLogger('Lazarus_Ground_Station.flight_loader')
+
+    @staticmethod
+    def load_session(session_dir, use_cache=True, chunk_size=50000):
+        csv_path = os.path.join(session_dir, FlightLoader.CSV_NAME)
+        return FlightLoader.load_csv(csv_path, use_cache, chunk_size)
+
+    @staticmethod
+    def load_csv(csv_path, use_cache=True, chunk_size=50000):
+        cache_path = os.path.join(os.path.dirname(csv_path),
+                                  FlightLoader.CACHE_NAME)
+        stat = os.stat(csv_path)
+        source = np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+        if use_cache and os.path.exists(cache_path):
+            try:
+                with np.load(cache_path) as cache:
+                    if np.array_equal(cache['source'], source):
+                        FlightLoader.logger.debug(
+                            f"Wczytano dane z cache: {cache_path}")
+                        return cache['data']
+            except (OSError, ValueError, KeyError) as e:
+                FlightLoader.logger.warning(
+                    f"Nieprawidłowy plik cache {cache_path}: {e}")
+
+        data = FlightLoader._parse_csv(csv_path, chunk_size)
+
+        if use_cache:
+            try:
+                with open(cache_path, 'wb') as f:
+                    np.savez(f, data=data, source=source)
+                FlightLoader.logger.info(f"Zapisano cache sesji: {cache_path}")
+            except OSError as e:
+                FlightLoader.logger.warning(
+                    f"Nie można zapisać cache {cache_path}: {e}")
+        return data
+
+    @staticmethod
+    def dtype_for(header):
+        schema = TelemetrySchema.get()
+        fields = []
+        for name in header:
+            if name == 'timestamp':
+                fields.append((name, 'datetime64[us]'))
+            elif schema.is_int(name):
+                fields.append((name, np.int64))
+            else:
+                fields.append((name, np.float64))
+        return np.dtype(fields)
+
+    @staticmethod
+    def _parse_csv(csv_path, chunk_size):
+        with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+            header = f.readline().strip().split(';')
+            if header != TelemetrySchema.get().csv_header:
+                FlightLoader.logger.warning(
+                    f"Nagłówek {csv_path} różni się od bieżącego "
+                    f"formatu CSV: {header}")
+            dtype = FlightLoader.dtype_for(header)
+            n_columns = len(header)
+
+            chunks = []
+            skipped = 0
+            while True:
+                lines = list(islice(f, chunk_size))
+                if not lines:
+                    break
+                rows = [line.rstrip('\r\n').split(';') for line in lines]
+                valid = [row for row in rows if len(row) == n_columns]
+                skipped += len(rows) - len(valid)
+                if valid:
+                    chunk, bad = FlightLoader._convert_chunk(
+                        np.array(valid, dtype=str), header, dtype)
+                    chunks.append(chunk)
+                    skipped += bad
+
+        if skipped:
+            FlightLoader.logger.warning(
+                f"Pominięto {skipped} uszkodzonych wierszy w {csv_path}")
+        if not chunks:
+            return np.zeros(0, dtype=dtype)
+        return np.concatenate(chunks)
+
+    @staticmethod
+    def _convert_chunk(table, header, dtype):
+        # Zwraca (tablica, liczba odrzuconych wierszy) - wiersze z
+        # nieczytelną wartością są pomijane
+        chunk = np.zeros(len(table), dtype=dtype)
+        bad = np.zeros(len(table), dtype=bool)
+        schema = TelemetrySchema.get()
+        for i, name in enumerate(header):
+            column = table[:, i]
+            if name == 'timestamp':
+                chunk[name] = FlightLoader._convert_column(
+                    column, 'datetime64[us]', bad)
+                continue
+            values = FlightLoader._convert_column(
+                np.where(column == '', 'nan', column), np.float64, bad)
+            if schema.is_int(name):
+                values = np.nan_to_num(values)
+            chunk[name] = values
+        if bad.any():
+            chunk = chunk[~bad]
+        return chunk, int(bad.sum())
+
+    @staticmethod
+    def _convert_column(column, dtype, bad):
+        try:
+            return column.astype(dtype)
+        except ValueError:
+            pass
+        # Wolna ścieżka tylko dla kolumny z uszkodzoną komórką
+        values = np.zeros(len(column), dtype=dtype)
+        for i, cell in enumerate(column):
+            try:
+                values[i] = cell
+            except ValueError:
+                bad[i] = True
+        return values
+
+    @staticmethod
+    def elapsed_seconds(data):
+        if len(data) == 0:
+            return np.zeros(0)
+        delta = data['timestamp'] - data['timestamp'][0]
+        return delta.astype(np.int64) / 1e6
+
+    @staticmethod
+    def summarize(data):
+        if len(data) == 0:
+            return {'samples': 0}
+
+        t = FlightLoader.elapsed_seconds(data)
+        summary = {
+            'samples': len(data),
+            'start': str(data['timestamp'][0]),
+            'duration': float(t[-1])
+        }
+
+        altitude = data['altitude']
+        if np.isfinite(altitude).any():
+            i = int(np.nanargmax(altitude))
+            summary['apogee'] = float(altitude[i])
+            summary['apogee_time'] = float(t[i])
+
+        velocity = data['velocity']
+        if np.isfinite(velocity).any():
+            i = int(np.nanargmax(np.abs(velocity)))
+            summary['max_velocity'] = float(velocity[i])
+            summary['max_velocity_time'] = float(t[i])
+
+        status = data['status']
+        events = {}
+        for name, bit in FlightLoader.STATUS_EVENTS.items():
+            hits = np.flatnonzero(status & (1 << bit))
+            events[name] = float(t[hits[0]]) if len(hits) else None
+        summary['events'] = events
+
+        # Wiersze bez informacji o transmisji mają len == 0
+        received = data['len'] > 0
+        if not received.any():
+            return summary
+        for name in ('rssi', 'snr'):
+            values = data[name][received]
+            summary[name] = {
+                'mean': float(values.mean()),
+                'min': int(values.min()),
+                'max': int(values.max()),
+                'std': float(values.std())
+            }
+        return summary
+
+    @staticmethod
+    def dynamics_state(data):
+        # Stan FlightDynamics odtwarzany przy wznowieniu sesji
+        if len(data) == 0:
+            return None
+
+        t = FlightLoader.elapsed_seconds(data)
+        state = {'elapsed': float(t[-1])}
+
+        fix = np.flatnonzero((data['latitude'] != 0.0) |
+                             (data['longitude'] != 0.0))
+        if len(fix):
+            state['launch_lat'] = float(data['latitude'][fix[0]])
+            state['launch_lon'] = float(data['longitude'][fix[0]])
+
+        # Wielkości pochodne z CSV; starsze pliki mają tylko surową wysokość
+        names = data.dtype.names
+        if ('max_altitude' in names and 'apogee_time' in names and
+                np.isfinite(data['max_altitude']).any()):
+            i = int(np.nanargmax(data['max_altitude']))
+            state['max_altitude'] = float(data['max_altitude'][i])
+            state['apogee_time'] = float(data['apogee_time'][i])
+        elif np.isfinite(data['altitude']).any():
+            i = int(np.nanargmax(data['altitude']))
+            state['max_altitude'] = float(data['altitude'][i])
+            state['apogee_time'] = float(t[i])
+        return state
+
+    @staticmethod
+    def find_sessions(base_dir=None):
+        if base_dir is None:
+            base_dir = Utils.get_appdata_path()
+        pattern = os.path.join(base_dir, 'session_*',
+                               FlightLoader.CSV_NAME)
+        sessions = [os.path.dirname(p) for p in glob.glob(pattern)]
+        return sorted(sessions,
+                      key=lambda p: int(p.rsplit('_', 1)[-1]))
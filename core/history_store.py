@@ -0,0 +1,172 @@
+import logging
+from collections import deque
+import numpy as np
+
+
+class _Level:
+    def __init__(self, width, capacity):
+        self.width = width
+        self.starts = deque(maxlen=capacity)
+        self.means = deque(maxlen=capacity)
+        self.mins = deque(maxlen=capacity)
+        self.maxs = deque(maxlen=capacity)
+        self.bucket = None
+        self.sum = 0.0
+        self.count = 0
+        self.min = 0.0
+        self.max = 0.0
+
+    def add(self, t, value):
+        bucket = int(t // self.width)
+        if bucket != self.bucket:
+            self.flush()
+            self.bucket = bucket
+            self.sum = value
+            self.count = 1
+            self.min = value
+            self.max = value
+        else:
+            self.sum += value
+            self.count += 1
+            if value < self.min:
+                self.min = value
+            elif value > self.max:
+                self.max = value
+
+    def flush(self):
+        if self.count:
+            self.starts.append(self.bucket * self.width)
+            self.means.append(self.sum / self.count)
+            self.mins.append(self.min)
+            self.maxs.append(self.max)
+        self.bucket = None
+        self.count = 0
+
+    def first_start(self):
+        if self.starts:
+            return self.starts[0]
+        if self.count:
+            return self.bucket * self.width
+        return None
+
+    def arrays(self):
+        starts = list(self.starts)
+        means = list(self.means)
+        mins = list(self.mins)
+        maxs = list(self.maxs)
+        # Otwarty (niepełny) kubełek również trafia na wykres
+        if self.count:
+            starts.append(self.bucket * self.width)
+            means.append(self.sum / self.count)
+            mins.append(self.min)
+            maxs.append(self.max)
+        return (np.array(starts), np.array(means),
+                np.array(mins), np.array(maxs))
+
+
+class HistoryStore:
+    # Surowy bufor ostatnich próbek + piramida min/max/średnia dla kubełków
+    # 1 s, 10 s i 60 s. Pamięć ograniczona niezależnie od długości lotu.
+    LEVELS = (1.0, 10.0, 60.0)
+    MAX_PLOT_POINTS = 2000
+
+    def __init__(self, raw_capacity=2000, level_capacity=3600):
+        self.logger = logging.getLogger('Lazarus_Ground_Station.history_store')
+        self.raw_capacity = raw_capacity
+        self.level_capacity = level_capacity
+        self.clear()
+
+    def clear(self):
+        # Surowe próbki w prealokowanym buforze o podwójnej pojemności -
+        # ostatnie raw_capacity próbek jest zawsze ciągłym wycinkiem, a
+        # przesunięcie na początek wykonywane raz na raw_capacity dopisań
+        self.raw_t = np.empty(2 * self.raw_capacity)
+        self.raw_v = np.empty(2 * self.raw_capacity)
+        self.raw_end = 0
+        self.levels = [_Level(width, self.level_capacity)
+                       for width in self.LEVELS]
+        self.first_t = None
+        self.last_t = None
+
+    def append(self, t, value):
+        if self.first_t is None:
+            self.first_t = t
+        self.last_t = t
+        if self.raw_end == len(self.raw_t):
+            keep = self.raw_capacity
+            self.raw_t[:keep] = self.raw_t[-keep:]
+            self.raw_v[:keep] = self.raw_v[-keep:]
+            self.raw_end = keep
+        self.raw_t[self.raw_end] = t
+        self.raw_v[self.raw_end] = value
+        self.raw_end += 1
+        for level in self.levels:
+            level.add(t, value)
+
+    def load(self, times, values):
+        # Wektorowe wypełnienie całej historii (odtwarzanie, wznowienie sesji)
+        self.clear()
+        times = np.asarray(times, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        if not len(times):
+            return
+
+        self.first_t = float(times[0])
+        self.last_t = float(times[-1])
+        count = min(len(times), self.raw_capacity)
+        self.raw_t[:count] = times[-count:]
+        self.raw_v[:count] = values[-count:]
+        self.raw_end = count
+
+        for level in self.levels:
+            buckets = np.floor(times / level.width).astype(np.int64)
+            bounds = np.flatnonzero(np.diff(buckets)) + 1
+            starts = np.concatenate(([0], bounds))
+            counts = np.diff(np.concatenate((starts, [len(values)])))
+            sums = np.add.reduceat(values, starts)
+            mins = np.minimum.reduceat(values, starts)
+            maxs = np.maximum.reduceat(values, starts)
+
+            # Ostatni kubełek zostaje otwarty dla kolejnych próbek
+            closed = slice(max(len(starts) - 1 - level.starts.maxlen, 0),
+                           len(starts) - 1)
+            level.starts.extend((buckets[starts[closed]] * level.width).tolist())
+            level.means.extend((sums[closed] / counts[closed]).tolist())
+            level.mins.extend(mins[closed].tolist())
+            level.maxs.extend(maxs[closed].tolist())
+            level.bucket = int(buckets[-1])
+            level.sum = float(sums[-1])
+            level.count = int(counts[-1])
+            level.min = float(mins[-1])
+            level.max = float(maxs[-1])
+
+    def raw(self):
+        start = max(self.raw_end - self.raw_capacity, 0)
+        return self.raw_t[start:self.raw_end], self.raw_v[start:self.raw_end]
+
+    def query(self, span=None):
+        # Zwraca (t, średnia, min, max); min/max = None dla surowych próbek
+        if self.last_t is None:
+            empty = np.zeros(0)
+            return empty, empty, None, None
+        if span is None:
+            span = self.last_t - self.first_t
+        start = max(self.last_t - span, self.first_t)
+
+        raw_t, raw_v = self.raw()
+        if raw_t[0] <= start or len(raw_t) < self.raw_capacity:
+            first = int(np.searchsorted(raw_t, start))
+            # Kopie - bufor jest nadpisywany, a wykres trzyma referencję
+            return raw_t[first:].copy(), raw_v[first:].copy(), None, None
+
+        level = self.levels[-1]
+        for candidate in self.levels:
+            first_start = candidate.first_start()
+            if (first_start is not None and
+                    first_start <= start + candidate.width and
+                    span / candidate.width <= self.MAX_PLOT_POINTS):
+                level = candidate
+                break
+        t, mean, low, high = level.arrays()
+        first = int(np.searchsorted(t, start - level.width))
+        return t[first:], mean[first:], low[first:], high[first:]
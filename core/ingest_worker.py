@@ -0,0 +1,171 @@
+import os
+import math
+import logging
+import threading
+import multiprocessing
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from core.shm_ring import SharedRing
+from core.telemetry_schema import TelemetrySchema
+from core.utils import Utils
+
+
+def run_ingest_worker(config, session_dir, schema_config, ring_name,
+                      ring_capacity, resumed_records, dynamics_state,
+                      notify_event, stop_event):
+    # Proces potomny: odczyt portu, dekodowanie, ProcessData i zapis sesji.
+    # Importy wewnątrz, aby proces GUI nie ładował ich przy starcie.
+    from core.serial_reader import SerialReader
+    from core.process_data import ProcessData
+    from core.csv_handler import CsvHandler
+    from core.session_journal import SessionJournal
+    from core.profiler import SamplingProfiler
+
+    Utils.use_session_directory(session_dir)
+    logging.basicConfig(
+        filename=os.path.join(session_dir, 'worker_events.log'),
+        filemode='a',
+        level=logging.INFO,
+        format='%(asctime)s %(levelname)-8s %(name)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    logger = logging.getLogger('Lazarus_Ground_Station.ingest_worker')
+    logger.info(f"Proces odczytu uruchomiony (PID {os.getpid()})")
+
+    TelemetrySchema.current = TelemetrySchema(**schema_config)
+    ring = SharedRing(TelemetrySchema.current.record_fields,
+                      ring_capacity, name=ring_name)
+    csv_handler = CsvHandler(resume=resumed_records > 0)
+    journal = SessionJournal(session_dir)
+    journal.open(records=resumed_records)
+
+    def handle_connection(connected):
+        ring.set_connected(connected)
+        notify_event.set()
+
+    def handle_record(data):
+        try:
+            csv_handler.write_row(data)
+            journal.append(data)
+            ring.write(data)
+            notify_event.set()
+        except Exception as e:
+            logger.exception(f"Błąd obsługi rekordu w procesie odczytu: {e}")
+
+    serial = SerialReader(config['port'], config['baudrate'],
+                          config['port_identity'])
+    processor = ProcessData()
+    if dynamics_state:
+        processor.dynamics.restore(dynamics_state)
+    # Brak pętli zdarzeń Qt w tym procesie - sloty wywoływane bezpośrednio
+    # w wątku odczytu
+    serial.telemetry_received.connect(processor.handle_telemetry,
+                                      Qt.DirectConnection)
+    serial.transmission_info_received.connect(
+        processor.handle_transmission_info, Qt.DirectConnection)
+    processor.processed_data_ready.connect(handle_record,
+                                           Qt.DirectConnection)
+    serial.connection_changed.connect(handle_connection, Qt.DirectConnection)
+
+    if config['lora_config']:
+        serial.LoraSet(config['lora_config'], config['is_config_selected'])
+
+    # Profiler procesu odczytu sterowany tylko zmienną środowiskową
+    profiler = SamplingProfiler(prefix='profile_worker')
+    if SamplingProfiler.enabled_by_env():
+        profiler.start()
+
+    serial.start_reading()
+    stop_event.wait()
+
+    serial.stop_reading()
+    profiler.stop()
+    csv_handler.close_file()
+    journal.close()
+    ring.close()
+    logger.info("Proces odczytu zakończony")
+
+
+class IngestProcess(QObject):
+    processed_data_ready = pyqtSignal(dict)
+    connection_changed = pyqtSignal(bool)
+    worker_exited = pyqtSignal(int)
+
+    RING_CAPACITY = 4096
+
+    def __init__(self, config, resumed_records=0, dynamics_state=None):
+        super().__init__()
+        self.logger = logging.getLogger(
+            'Lazarus_Ground_Station.ingest_process')
+        self.schema = TelemetrySchema.get()
+        self.ring = SharedRing(self.schema.record_fields,
+                               self.RING_CAPACITY, create=True)
+        self.int_fields = [i for i, name in enumerate(self.ring.fields)
+                           if self.schema.is_int(name)]
+
+        context = multiprocessing.get_context('spawn')
+        self.notify_event = context.Event()
+        self.stop_event = context.Event()
+        worker_config = {key: config.get(key) for key in
+                         ('port', 'baudrate', 'port_identity',
+                          'lora_config', 'is_config_selected')}
+        self.process = context.Process(
+            target=run_ingest_worker,
+            args=(worker_config, Utils.session_path, self.schema.to_config(),
+                  self.ring.name, self.RING_CAPACITY, resumed_records,
+                  dynamics_state, self.notify_event, self.stop_event),
+            daemon=True)
+
+        self.port = config['port']
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.process.start()
+        self.logger.info(
+            f"Uruchomiono proces odczytu (PID {self.process.pid}), "
+            f"bufor pamięci współdzielonej: {self.ring.name}")
+        self.running = True
+        self.thread = threading.Thread(target=self._listen)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        # Event zabitego procesu może pozostać w niespójnym stanie -
+        # set() zablokowałby się na zawsze
+        if self.process.is_alive():
+            self.stop_event.set()
+        self.notify_event.set()
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=1.0)
+        if self.process.is_alive():
+            self.process.join(timeout=3.0)
+        if self.process.is_alive():
+            self.logger.warning("Proces odczytu nie zakończył się - wymuszam zakończenie")
+            self.process.terminate()
+        self.ring.close()
+        self.logger.info("Proces odczytu zatrzymany")
+
+    def _listen(self):
+        fields = self.ring.fields
+        connection = self.ring.connection_state()
+        while self.running:
+            if not self.notify_event.wait(timeout=0.5):
+                if not self.process.is_alive():
+                    self.logger.error(
+                        f"Proces odczytu zakończył się nieoczekiwanie "
+                        f"(kod {self.process.exitcode})")
+                    self.worker_exited.emit(self.process.exitcode)
+                    break
+                continue
+            self.notify_event.clear()
+            state = self.ring.connection_state()
+            if state != connection:
+                connection = state
+                self.connection_changed.emit(bool(state & 1))
+            for row in self.ring.read_new():
+                record = dict(zip(fields, row.tolist()))
+                for i in self.int_fields:
+                    value = row[i]
+                    record[fields[i]] = 0 if math.isnan(value) else int(value)
+                self.processed_data_ready.emit(record)
@@ -0,0 +1,163 @@
+import binascii
+import logging
+from collections import deque
+
+
+class PacketIntegrity:
+    # Ramka z kontrolą integralności: "<seq>;<pola...>*<CRC16 hex>",
+    # CRC-16/CCITT-FALSE (init 0xFFFF) liczone z bajtów przed '*'
+    ALLOWED = b'0123456789+-.;eE'
+    SEQ_MODULO = 65536
+    WINDOW = 64
+    # Po tylu kolejnych ramkach "wstecz" uznajemy, że nadajnik zaczął
+    # numerację od nowa
+    RESYNC_AFTER = 8
+    FIELDS = ['seq', 'corrupt_frames', 'duplicate_frames',
+              'out_of_order_frames', 'missing_frames']
+
+    def __init__(self, field_count, required=False):
+        self.logger = logging.getLogger(
+            'Lazarus_Ground_Station.packet_integrity')
+        self.field_count = field_count
+        self.required = required
+        self.last_seq = None
+        self.recent = deque(maxlen=self.WINDOW)
+        self.recent_set = set()
+        # Numery pominięte w ostatnim oknie - spóźniona ramka zmniejsza
+        # licznik brakujących
+        self.gaps = deque(maxlen=self.WINDOW)
+        self.gap_set = set()
+        self.backward_run = 0
+        self.pending = None
+        self.seq = -1
+        self.accepted = 0
+        self.corrupt = 0
+        self.duplicate = 0
+        self.out_of_order = 0
+        self.missing = 0
+
+    def check(self, frame):
+        # Zwraca listę pól (str) lub None dla odrzuconej ramki. Wszystkie
+        # testy wykonywane są na bajtach, przed jakimkolwiek float()/int().
+        # Przyjęcie ramki zatwierdza dopiero commit() po parsowaniu pól.
+        self.pending = None
+        frame = frame.strip()
+        has_crc = b'*' in frame
+        if has_crc:
+            body, _, crc = frame.rpartition(b'*')
+            if len(crc) != 4 or binascii.crc_hqx(body, 0xFFFF) != self._hex(crc):
+                return self.reject("niezgodna suma kontrolna")
+        elif self.required:
+            return self.reject("brak sumy kontrolnej")
+        else:
+            body = frame
+
+        if body.translate(None, self.ALLOWED):
+            return self.reject("niedozwolone znaki")
+
+        fields = body.decode('ascii').split(';')
+        seq_text = fields.pop(0) if has_crc else None
+        if len(fields) < self.field_count:
+            return self.reject(f"niewystarczająca liczba pól ({len(fields)})")
+
+        if seq_text is not None:
+            if not seq_text.isdigit():
+                return self.reject("nieprawidłowy numer sekwencji")
+            seq = int(seq_text) % self.SEQ_MODULO
+            if not self._check_sequence(seq):
+                return None
+            self.pending = seq
+        return fields
+
+    def commit(self):
+        # Ramka z check() została poprawnie sparsowana - dopiero teraz jej
+        # numer trafia do okna i przesuwa strumień
+        seq, self.pending = self.pending, None
+        self.accepted += 1
+        if seq is None:
+            self.seq = -1
+            return
+
+        if self.last_seq is not None:
+            gap = (seq - self.last_seq) % self.SEQ_MODULO
+            if gap > self.SEQ_MODULO // 2:
+                self.logger.info(
+                    f"Resynchronizacja sekwencji: seq={seq}, ostatnia={self.last_seq}")
+                self.resync()
+            else:
+                self.missing += gap - 1
+                for skipped in range(max(gap - 1 - self.WINDOW, 0) + 1, gap):
+                    self._remember(self.gaps, self.gap_set,
+                                   (self.last_seq + skipped) % self.SEQ_MODULO)
+        self.backward_run = 0
+
+        self._remember(self.recent, self.recent_set, seq)
+        self.last_seq = seq
+        self.seq = seq
+
+    def reject(self, reason):
+        self.pending = None
+        self.corrupt += 1
+        self.logger.debug(f"Odrzucono uszkodzoną ramkę: {reason}")
+        return None
+
+    def resync(self):
+        # Zapominamy historię sekwencji - następna ramka staje się punktem
+        # odniesienia (restart nadajnika, ponowne połączenie portu)
+        self.last_seq = None
+        self.recent.clear()
+        self.recent_set.clear()
+        self.gaps.clear()
+        self.gap_set.clear()
+        self.backward_run = 0
+
+    def stats(self):
+        return {
+            'seq': self.seq,
+            'corrupt_frames': self.corrupt,
+            'duplicate_frames': self.duplicate,
+            'out_of_order_frames': self.out_of_order,
+            'missing_frames': self.missing
+        }
+
+    @staticmethod
+    def _hex(text):
+        try:
+            return int(text, 16)
+        except ValueError:
+            return -1
+
+    @staticmethod
+    def _remember(window, members, seq):
+        if len(window) == window.maxlen:
+            members.discard(window[0])
+        window.append(seq)
+        members.add(seq)
+
+    def _check_sequence(self, seq):
+        if seq in self.recent_set:
+            self.duplicate += 1
+            self.logger.debug(f"Zduplikowana ramka: seq={seq}")
+            return False
+
+        if self.last_seq is not None:
+            gap = (seq - self.last_seq) % self.SEQ_MODULO
+            if gap > self.SEQ_MODULO // 2:
+                back = self.SEQ_MODULO - gap
+                self.backward_run += 1
+                if back <= self.WINDOW and self.backward_run < self.RESYNC_AFTER:
+                    # Ramka nieco starsza od ostatniej przyjętej - nie cofamy
+                    # strumienia
+                    self.out_of_order += 1
+                    if seq in self.gap_set:
+                        # Ramka dotarła - nie jest brakująca; kolejna jej
+                        # kopia będzie już duplikatem
+                        self.gap_set.discard(seq)
+                        self.missing -= 1
+                        self._remember(self.recent, self.recent_set, seq)
+                    self.logger.debug(
+                        f"Ramka poza kolejnością: seq={seq}, ostatnia={self.last_seq}")
+                    return False
+                # Duży skok wstecz lub seria ramek wstecz - commit() wykona
+                # resynchronizację
+        return True
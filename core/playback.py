@@ -0,0 +1,104 @@
+import time
+import logging
+import numpy as np
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from core.flight_loader import FlightLoader
+
+
+class PlaybackController(QObject):
+    record_ready = pyqtSignal(dict)
+    position_changed = pyqtSignal(float)
+    seeked = pyqtSignal(int)
+    state_changed = pyqtSignal(bool)
+
+    TICK_MS = 20
+    # Powyżej tej liczby rekordów na jeden takt zamiast odtwarzać
+    # pakiet po pakiecie wykonujemy skok (seek)
+    MAX_RECORDS_PER_TICK = 50
+
+    def __init__(self, csv_path):
+        super().__init__()
+        self.logger = logging.getLogger(
+            'Lazarus_Ground_Station.playback')
+        self.csv_path = csv_path
+        self.data = FlightLoader.load_csv(csv_path)
+        self.times = FlightLoader.elapsed_seconds(self.data)
+        self.fields = [name for name in self.data.dtype.names
+                       if name != 'timestamp']
+        self.duration = float(self.times[-1]) if len(self.times) else 0.0
+
+        self.index = 0
+        self.position = 0.0
+        self.speed = 1.0
+        self.playing = False
+        self.last_tick = None
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.TICK_MS)
+        self.timer.timeout.connect(self._tick)
+
+        self.logger.info(
+            f"Wczytano sesję do odtwarzania: {csv_path}, "
+            f"rekordów: {len(self.data)}, czas: {self.duration:.1f} s")
+
+    def record(self, index):
+        row = self.data[index]
+        record = {name: row[name].item() for name in self.fields}
+        record['elapsed'] = float(self.times[index])
+        return record
+
+    def column(self, name, end=None):
+        return self.data[name][:end]
+
+    def play(self):
+        if self.playing or not len(self.data):
+            return
+        if self.index >= len(self.data):
+            self.seek(0.0)
+        self.playing = True
+        self.last_tick = time.monotonic()
+        self.timer.start()
+        self.state_changed.emit(True)
+
+    def pause(self):
+        if not self.playing:
+            return
+        self.playing = False
+        self.timer.stop()
+        self.state_changed.emit(False)
+
+    def toggle(self):
+        if self.playing:
+            self.pause()
+        else:
+            self.play()
+
+    def set_speed(self, speed):
+        self.speed = speed
+        self.logger.debug(f"Prędkość odtwarzania: {speed}x")
+
+    def seek(self, position):
+        self.position = min(max(position, 0.0), self.duration)
+        self.index = int(np.searchsorted(self.times, self.position,
+                                         side='right'))
+        self.last_tick = time.monotonic()
+        self.seeked.emit(self.index)
+        self.position_changed.emit(self.position)
+
+    def _tick(self):
+        now = time.monotonic()
+        self.position += (now - self.last_tick) * self.speed
+        self.last_tick = now
+
+        end = int(np.searchsorted(self.times, self.position,
+                                  side='right'))
+        if end - self.index > self.MAX_RECORDS_PER_TICK:
+            self.seek(self.position)
+        else:
+            for i in range(self.index, end):
+                self.record_ready.emit(self.record(i))
+            self.index = end
+            self.position_changed.emit(min(self.position, self.duration))
+
+        if self.index >= len(self.data):
+            self.pause()
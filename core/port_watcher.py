@@ -0,0 +1,118 @@
+import logging
+import threading
+import serial.tools.list_ports
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class PortWatcher(QObject):
+    ports_changed = pyqtSignal(list)
+    port_added = pyqtSignal(dict)
+    port_removed = pyqtSignal(dict)
+
+    _instance = None
+
+    def __init__(self, interval=1.0):
+        super().__init__()
+        self.logger = logging.getLogger('Lazarus_Ground_Station.port_watcher')
+        self.interval = interval
+        self.running = False
+        self.thread = None
+        self.wakeup = threading.Event()
+        self.lock = threading.Lock()
+        self.cache = None
+        self.forced = False
+
+    @staticmethod
+    def instance():
+        if PortWatcher._instance is None:
+            PortWatcher._instance = PortWatcher()
+        return PortWatcher._instance
+
+    @staticmethod
+    def describe(port):
+        return {
+            'device': port.device,
+            'description': port.description,
+            'vid': port.vid,
+            'pid': port.pid,
+            'serial_number': port.serial_number
+        }
+
+    @staticmethod
+    def enumerate():
+        return [PortWatcher.describe(p) for p in serial.tools.list_ports.comports()]
+
+    @staticmethod
+    def identity(port_info):
+        # Urządzenia bez VID/PID (porty wirtualne) identyfikujemy tylko nazwą
+        if port_info.get('vid') is None:
+            return None
+        return {
+            'vid': port_info['vid'],
+            'pid': port_info['pid'],
+            'serial_number': port_info['serial_number']
+        }
+
+    @staticmethod
+    def find_device(identity, ports):
+        for port in ports:
+            if (port['vid'] == identity['vid'] and
+                    port['pid'] == identity['pid'] and
+                    port['serial_number'] == identity['serial_number']):
+                return port['device']
+        return None
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._watch)
+        self.thread.daemon = True
+        self.thread.start()
+        self.logger.info("Monitor portów szeregowych uruchomiony")
+
+    def stop(self):
+        self.running = False
+        self.wakeup.set()
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=1.0)
+        self.logger.info("Monitor portów szeregowych zatrzymany")
+
+    def refresh(self):
+        self.forced = True
+        self.wakeup.set()
+
+    def ports(self):
+        with self.lock:
+            return None if self.cache is None else list(self.cache)
+
+    def _watch(self):
+        while self.running:
+            try:
+                ports = self.enumerate()
+            except Exception as e:
+                self.logger.error(f"Błąd wyszukiwania portów: {e}")
+                ports = []
+
+            with self.lock:
+                previous = self.cache
+                self.cache = ports
+
+            changed = previous is None or ports != previous
+            if changed:
+                old = {p['device']: p for p in previous or []}
+                new = {p['device']: p for p in ports}
+                for device in new.keys() - old.keys():
+                    if previous is not None:
+                        self.logger.info(f"Podłączono port: {device}")
+                        self.port_added.emit(new[device])
+                for device in old.keys() - new.keys():
+                    self.logger.info(f"Odłączono port: {device}")
+                    self.port_removed.emit(old[device])
+                self.logger.debug(f"Dostępne porty: {list(new)}")
+            if changed or self.forced:
+                self.forced = False
+                self.ports_changed.emit(ports)
+
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
@@ -1,6 +1,7 @@
 import re
 import logging
 from PyQt5.QtCore import QObject, pyqtSignal
+from core.flight_dynamics import FlightDynamics
 
 
 class ProcessData(QObject):
@@ -12,10 +13,20 @@ class ProcessData(QObject):
             'Lazarus_Ground_Station.data_processor')
         self.current_telemetry = None
         self.current_transmission = None
+        self.current_derived = {}
         self.past = None
+        self.dynamics = FlightDynamics()
 
     def handle_telemetry(self, telemetry):
+        # Czas odbioru (time.monotonic() wątku odczytu) służy tylko filtrowi -
+        # nie trafia do rekordu, dziennika ani serwera telemetrii
+        received_at = telemetry.pop('received_at', None)
         self.current_telemetry = telemetry
+        try:
+            self.current_derived = self.dynamics.update(telemetry, received_at)
+        except Exception as e:
+            self.logger.exception(
+                f"Błąd podczas wyznaczania wielkości pochodnych: {e}")
         self.process_and_emit()
 
     def handle_transmission_info(self, transmission):
@@ -26,7 +37,8 @@ class ProcessData(QObject):
         if self.current_telemetry and self.current_transmission:
             try:
                 combined_data = {**self.current_telemetry,
-                                 **self.current_transmission}
+                                 **self.current_transmission,
+                                 **self.current_derived}
                 self.logger.debug(
                     f"Połączone dane do wysłania: {combined_data}")
                 self.processed_data_ready.emit(
@@ -0,0 +1,114 @@
+import os
+import sys
+import time
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from core.utils import Utils
+
+
+class SamplingProfiler:
+    # Funkcje gorącej ścieżki, do których przypisujemy czas próbki - czas
+    # liczony włącznie: próbka trafia do każdego etapu obecnego na stosie,
+    # więc update_data obejmuje też LivePlot.update_plot i zapis CSV
+    STAGES = {
+        ('serial_reader.py', 'DecodeLine'): 'DecodeLine',
+        ('process_data.py', 'process_and_emit'): 'process_and_emit',
+        ('main_window.py', 'update_data'): 'update_data',
+        ('live_plot.py', 'update_plot'): 'LivePlot.update_plot',
+        ('csv_handler.py', 'write_row'): 'CsvHandler.write_row',
+    }
+    ENV_VARIABLE = 'LAZARUS_PROFILE'
+
+    def __init__(self, interval=0.005, prefix='profile'):
+        self.logger = logging.getLogger('Lazarus_Ground_Station.profiler')
+        self.interval = interval
+        self.prefix = prefix
+        self.running = False
+        self.thread = None
+        self.stacks = Counter()
+        self.stages = Counter()
+        self.samples = 0
+        self.started = None
+        self.labels = {}
+
+    @staticmethod
+    def enabled_by_env():
+        return os.getenv(SamplingProfiler.ENV_VARIABLE, '') not in ('', '0')
+
+    def start(self):
+        if self.running:
+            return
+        self.stacks.clear()
+        self.stages.clear()
+        self.samples = 0
+        self.started = datetime.now()
+        self.running = True
+        self.thread = threading.Thread(target=self._sample_loop,
+                                       name='profiler')
+        self.thread.daemon = True
+        self.thread.start()
+        self.logger.info(
+            f"Profiler uruchomiony (próbkowanie co {self.interval * 1000:.0f} ms)")
+
+    def stop(self):
+        if not self.running:
+            return None
+        self.running = False
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=1.0)
+        return self.write()
+
+    def _label(self, code):
+        label = self.labels.get(code)
+        if label is None:
+            filename = os.path.basename(code.co_filename)
+            label = f"{code.co_name} ({filename}:{code.co_firstlineno})"
+            self.labels[code] = label
+        return label
+
+    def _sample_loop(self):
+        own_id = threading.get_ident()
+        while self.running:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                stages = set()
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(self._label(code))
+                    key = (os.path.basename(code.co_filename), code.co_name)
+                    if key in self.STAGES:
+                        stages.add(self.STAGES[key])
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                stack.reverse()
+                self.stacks[';'.join(stack)] += 1
+                self.stages.update(stages)
+            self.samples += 1
+            time.sleep(self.interval)
+
+    def write(self):
+        session_dir = Utils.session_path or Utils.get_appdata_path()
+        stamp = self.started.strftime('%Y%m%d_%H%M%S')
+        folded_path = os.path.join(session_dir, f"{self.prefix}_{stamp}.folded")
+        try:
+            # Format "folded stacks" - flamegraph.pl, speedscope, inferno
+            with open(folded_path, 'w', encoding='utf-8') as f:
+                for stack, count in self.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+        except OSError as e:
+            self.logger.error(f"Nie można zapisać wyników profilera: {e}")
+            return None
+
+        period = self.interval * 1000
+        summary = ", ".join(
+            f"{stage}: {count} ({count * period:.0f} ms)"
+            for stage, count in self.stages.most_common())
+        self.logger.info(
+            f"Profiler zatrzymany: {self.samples} próbek, zapisano {folded_path}")
+        self.logger.info(f"Czas etapów włącznie (próbki): {summary or 'brak'}")
+        return folded_path
@@ -4,9 +4,10 @@ from PyQt5.QtWidgets import (QApplication, QDialog,
                              QVBoxLayout, QHBoxLayout,
                              QLabel,
                              QComboBox, QPushButton,
-                             QGroupBox)
+                             QGroupBox, QFileDialog, QCheckBox)
 from PyQt5.QtCore import Qt
-import serial.tools.list_ports
+from core.utils import Utils
+from core.port_watcher import PortWatcher
 
 
 class SerialConfigDialog(QDialog):
@@ -49,12 +50,18 @@ class SerialConfigDialog(QDialog):
             'net': 'OFF',
         }
         self.is_config_selected = False
+        self.playback_path = None
+        self.multiprocess = False
+        self.port_identity = None
+        self.port_watcher = PortWatcher.instance()
 
         layout = QVBoxLayout()
 
         port_layout = QHBoxLayout()
         port_layout.addWidget(QLabel("Port COM:"))
         self.port_combo = QComboBox()
+        self.port_watcher.ports_changed.connect(self.populate_ports)
+        self.port_watcher.start()
         self.refresh_ports()
         port_layout.addWidget(self.port_combo)
 
@@ -160,6 +167,11 @@ class SerialConfigDialog(QDialog):
         lora_group.setLayout(lora_layout)
         layout.addWidget(lora_group)
 
+        self.multiprocess_check = QCheckBox(
+            "Odczyt i zapis w osobnym procesie")
+        self.multiprocess_check.setStyleSheet("color: #ecf0f1;")
+        layout.addWidget(self.multiprocess_check)
+
         btn_layout = QHBoxLayout()
         connect_btn = QPushButton("Połącz i konfiguruj")
         connect_btn.clicked.connect(self.accept)
@@ -183,19 +195,38 @@ class SerialConfigDialog(QDialog):
         btn_layout.addWidget(cancel_btn)
         layout.addLayout(btn_layout)
 
+        playback_btn = QPushButton("Odtwórz zapisaną sesję")
+        playback_btn.clicked.connect(self.accept_playback)
+        playback_btn.setStyleSheet(
+            "background-color: #8e44ad;")
+        layout.addWidget(playback_btn)
+
         self.setLayout(layout)
 
     def refresh_ports(self):
+        # Wyszukiwanie portów odbywa się w wątku monitora - lista
+        # aktualizowana jest sygnałem ports_changed
+        ports = self.port_watcher.ports()
+        if ports is None:
+            self.port_combo.clear()
+            self.port_combo.addItem("Wyszukiwanie portów...")
+        else:
+            self.populate_ports(ports)
+        self.port_watcher.refresh()
+
+    def populate_ports(self, ports):
+        selected = self.port_combo.currentText()
         self.port_combo.clear()
-        ports = serial.tools.list_ports.comports()
         if ports:
             for port in ports:
-                self.port_combo.addItem(port.device)
+                self.port_combo.addItem(port['device'], port)
+            if selected in [p['device'] for p in ports]:
+                self.port_combo.setCurrentText(selected)
         else:
             self.port_combo.addItem(
                 "Brak dostępnych portów")
         self.logger.debug(
-            f"Dostępne porty: {[p.device for p in ports]}")
+            f"Dostępne porty: {[p['device'] for p in ports]}")
 
     def accept(self):
         self._get_settings()
@@ -212,12 +243,28 @@ class SerialConfigDialog(QDialog):
         self.is_config_selected = False
         super().accept()
 
+    def accept_playback(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Wybierz plik sesji",
+            Utils.get_appdata_path(),
+            "Telemetria (telemetry_data.csv);;CSV (*.csv)")
+        if not path:
+            return
+        self.playback_path = path
+        self.lora_config = None
+        self.logger.info(f"Wybrano sesję do odtwarzania: {path}")
+        super().accept()
+
     def _get_settings(self):
-        if self.port_combo.currentText() == "Brak dostępnych portów":
+        port_info = self.port_combo.currentData()
+        if port_info is None:
             self.port_name = ""
+            self.port_identity = None
         else:
-            self.port_name = self.port_combo.currentText()
+            self.port_name = port_info['device']
+            self.port_identity = PortWatcher.identity(port_info)
         self.baud_rate = int(self.baud_combo.currentText())
+        self.multiprocess = self.multiprocess_check.isChecked()
         if self.lora_config is not None:
             self.lora_config = {
                 'frequency': self.freq_combo.currentText(),
@@ -234,7 +281,10 @@ class SerialConfigDialog(QDialog):
     def get_settings(self):
         return {
             'port': self.port_name,
+            'port_identity': self.port_identity,
             'baudrate': self.baud_rate,
             'lora_config': self.lora_config,
-            'is_config_selected': self.is_config_selected
+            'is_config_selected': self.is_config_selected,
+            'playback_path': self.playback_path,
+            'multiprocess': self.multiprocess
         }
\ No newline at end of file
@@ -4,19 +4,34 @@ import re
 import logging
 import threading
 from PyQt5.QtCore import QObject, pyqtSignal
+from core.telemetry_schema import TelemetrySchema
+from core.port_watcher import PortWatcher
+from core.packet_integrity import PacketIntegrity
 
 
 class SerialReader(QObject):
     telemetry_received = pyqtSignal(dict)
     transmission_info_received = pyqtSignal(dict)
+    connection_changed = pyqtSignal(bool)
 
-    def __init__(self, port="COM7", baudrate=9600):
+    RECONNECT_INTERVAL = 0.5
+
+    def __init__(self, port="COM7", baudrate=9600, identity=None, watcher=None):
         super().__init__()
         self.logger = logging.getLogger('Lazarus_Ground_Station.serial_reader')
         self.port = port
         self.baudrate = baudrate
         self.running = False
         self.thread = None
+        self.schema = TelemetrySchema.get()
+        self.integrity = PacketIntegrity(self.schema.field_count,
+                                         self.schema.require_integrity)
+        # Identyfikator urządzenia (VID/PID/numer seryjny) pozwala odnaleźć
+        # modem po ponownym podłączeniu, nawet pod inną nazwą portu
+        self.identity = identity
+        self.watcher = watcher
+        self.lora_config = None
+        self.is_config_selected = False
 
         try:
             self.ser = serial.Serial(self.port, self.baudrate, timeout=0.1)
@@ -45,7 +60,15 @@ class SerialReader(QObject):
 
     def _read_serial(self):
         self.logger.debug("Rozpoczęto działanie metody _read_serial")
-        while self.running and self.ser and self.ser.is_open:
+        if self.identity is None and self.port:
+            self.identity = self._lookup_identity()
+
+        while self.running:
+            if not self.ser or not self.ser.is_open:
+                if not self.port and self.identity is None:
+                    break
+                self._reconnect()
+                continue
             try:
                 line = self.ser.readline().decode(errors='ignore').strip()
                 if line:
@@ -54,10 +77,69 @@ class SerialReader(QObject):
                 else:
                     self.logger.debug("Odczytano pustą linię")
                 time.sleep(0.030)
+            except serial.SerialException as e:
+                self.logger.error(f"Utracono połączenie z portem {self.port}: {e}")
+                self._close_port()
+                self.connection_changed.emit(False)
             except Exception as e:
                 self.logger.error(f"Błąd odczytu: {e}")
                 time.sleep(0.030)
 
+    def _available_ports(self):
+        ports = self.watcher.ports() if self.watcher else None
+        if ports is None:
+            ports = PortWatcher.enumerate()
+        return ports
+
+    def _lookup_identity(self):
+        try:
+            for port in self._available_ports():
+                if port['device'] == self.port:
+                    return PortWatcher.identity(port)
+        except Exception as e:
+            self.logger.warning(f"Nie można ustalić identyfikatora portu {self.port}: {e}")
+        return None
+
+    def _close_port(self):
+        try:
+            if self.ser:
+                self.ser.close()
+        except Exception:
+            pass
+        self.ser = None
+
+    def _reconnect(self):
+        # Jedna próba na RECONNECT_INTERVAL - czas ponownego połączenia po
+        # pojawieniu się urządzenia jest ograniczony do tego interwału
+        # (plus czas konfiguracji LoRa)
+        time.sleep(self.RECONNECT_INTERVAL)
+        device = self.port
+        if self.identity is not None:
+            try:
+                device = PortWatcher.find_device(self.identity, self._available_ports())
+            except Exception as e:
+                self.logger.debug(f"Błąd wyszukiwania urządzenia: {e}")
+                device = None
+            if device is None:
+                return
+
+        try:
+            self.ser = serial.Serial(device, self.baudrate, timeout=0.1)
+        except serial.SerialException as e:
+            self.ser = None
+            self.logger.debug(f"Ponowne otwarcie portu {device} nieudane: {e}")
+            return
+
+        if device != self.port:
+            self.logger.info(f"Urządzenie dostępne pod nową nazwą portu: {device}")
+            self.port = device
+        self.logger.info(f"Ponownie połączono z portem {self.port}")
+        # Nadajnik mógł zostać zrestartowany w czasie przerwy
+        self.integrity.resync()
+        if self.lora_config:
+            self.LoraSet(self.lora_config, self.is_config_selected)
+        self.connection_changed.emit(True)
+
     def DecodeLine(self, line):
         self.logger.debug(f"Odebrano linię: {line}")
         if line.startswith("+TEST: RX"):
@@ -66,37 +148,28 @@ class SerialReader(QObject):
                 try:
                     hex_data = match.group(1)
                     self.logger.debug(f"Odczytany hex: {hex_data}")
+                    received_at = time.monotonic()
                     byte_data = bytes.fromhex(hex_data)
-                    decoded_string = byte_data.decode('utf-8', errors='replace')
-                    self.logger.debug(f"Zdekodowany string: {decoded_string}")
-                    data = decoded_string.split(";")
-
-                    if len(data) < 7:
-                        self.logger.warning(f"Niewystarczająca liczba danych: {data}")
+                    data = self.integrity.check(byte_data)
+                    if data is None:
+                        self.logger.warning(
+                            f"Odrzucono ramkę: {byte_data!r} ({self.integrity.stats()})")
                         return
+                    self.logger.debug(f"Zdekodowane pola: {data}")
 
-                    telemetry = {
-                        'velocity': float(data[0]),
-                        'pitch': float(data[1]),
-                        'roll': float(data[2]),
-                        'status': int(data[3]),
-                        'altitude': float(data[4]),
-                        'latitude': float(data[5]),
-                        'longitude': float(data[6])
-                    }
+                    telemetry = self.schema.parse(data)
+                    self.integrity.commit()
+                    telemetry.update(self.integrity.stats())
+                    # Czas odbioru w wątku odczytu - nie zależy od opóźnień
+                    # kolejki sygnałów w wątku GUI
+                    telemetry['received_at'] = received_at
 
                     self.logger.info(
-                        f"Dane telemetryczne: "
-                        f"V={telemetry['velocity']}, "
-                        f"P={telemetry['pitch']}, "
-                        f"R={telemetry['roll']}, "
-                        f"ST={telemetry['status']}, "
-                        f"ALT={telemetry['altitude']}, "
-                        f"LAT={telemetry['latitude']}, "
-                        f"LON={telemetry['longitude']}")
+                        f"Dane telemetryczne: {self.schema.describe(telemetry)}")
 
                     self.telemetry_received.emit(telemetry)
                 except Exception as e:
+                    self.integrity.reject(str(e))
                     self.logger.error(f"Błąd dekodowania danych telemetrycznych: {e}")
             else:
                 self.logger.debug("Nie znaleziono danych hex w linii RX")
@@ -124,6 +197,8 @@ class SerialReader(QObject):
                 self.logger.debug("Nie rozpoznano formatu linii transmisyjnej")
 
     def LoraSet(self, config, is_config_selected):
+        self.lora_config = config
+        self.is_config_selected = is_config_selected
         if self.ser is None:
             self.logger.warning("Port szeregowy nie jest dostępny, pomijam konfigurację LoRa")
             return
@@ -0,0 +1,168 @@
+import os
+import json
+import time
+import zlib
+import struct
+import logging
+from datetime import datetime
+
+
+class SessionJournal:
+    JOURNAL_NAME = 'session.journal'
+    CHECKPOINT_NAME = 'session.checkpoint'
+    MAGIC = 0x4C5A
+    # magic, długość danych, crc32 danych
+    FRAME_HEADER = struct.Struct('<HII')
+
+    def __init__(self, session_dir, checkpoint_interval=1.0,
+                 checkpoint_records=50):
+        self.logger = logging.getLogger(
+            'Lazarus_Ground_Station.session_journal')
+        self.session_dir = session_dir
+        self.journal_path = os.path.join(session_dir, self.JOURNAL_NAME)
+        self.checkpoint_path = os.path.join(session_dir,
+                                            self.CHECKPOINT_NAME)
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoint_records = checkpoint_records
+        self.file = None
+        self.records = 0
+        self.pending = 0
+        self.last_checkpoint = 0.0
+
+    def open(self, records=0):
+        try:
+            self.file = open(self.journal_path, 'ab')
+            self.records = records
+            self.checkpoint()
+            self.logger.info(
+                f"Dziennik sesji otwarty: {self.journal_path} "
+                f"(rekordów: {records})")
+        except OSError as e:
+            self.file = None
+            self.logger.error(f"Nie można otworzyć dziennika sesji: {e}")
+
+    def append(self, data):
+        if not self.file:
+            return
+
+        try:
+            record = {'timestamp': datetime.now().isoformat(), **data}
+            payload = json.dumps(record).encode('utf-8')
+            header = self.FRAME_HEADER.pack(self.MAGIC, len(payload),
+                                            zlib.crc32(payload))
+            self.file.write(header + payload)
+            # flush przekazuje dane do systemu (przeżyją awarię aplikacji),
+            # fsync tylko przy punkcie kontrolnym
+            self.file.flush()
+            self.records += 1
+            self.pending += 1
+
+            if (self.pending >= self.checkpoint_records or
+                    time.monotonic() - self.last_checkpoint
+                    >= self.checkpoint_interval):
+                self.checkpoint()
+        except Exception as e:
+            self.logger.error(f"Błąd zapisu do dziennika sesji: {e}")
+
+    def checkpoint(self, clean=False):
+        if not self.file:
+            return
+
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        state = {
+            'offset': self.file.tell(),
+            'records': self.records,
+            'clean': clean
+        }
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+        self.pending = 0
+        self.last_checkpoint = time.monotonic()
+
+    def close(self):
+        if self.file:
+            try:
+                self.checkpoint(clean=True)
+                self.file.close()
+                self.logger.info("Dziennik sesji zamknięty poprawnie")
+            except Exception as e:
+                self.logger.error(
+                    f"Błąd zamykania dziennika sesji: {e}")
+            finally:
+                self.file = None
+
+    @staticmethod
+    def read_checkpoint(session_dir):
+        path = os.path.join(session_dir, SessionJournal.CHECKPOINT_NAME)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def needs_recovery(session_dir):
+        if not session_dir or not os.path.exists(
+                os.path.join(session_dir, SessionJournal.JOURNAL_NAME)):
+            return False
+        state = SessionJournal.read_checkpoint(session_dir)
+        return state is None or not state.get('clean', False)
+
+    @staticmethod
+    def decode_frames(content):
+        # Zwraca (rekordy, liczba poprawnie odczytanych bajtów); dekodowanie
+        # kończy się na pierwszej niepełnej lub uszkodzonej ramce
+        header_size = SessionJournal.FRAME_HEADER.size
+        records = []
+        offset = 0
+        while offset + header_size <= len(content):
+            magic, length, crc = SessionJournal.FRAME_HEADER.unpack_from(
+                content, offset)
+            end = offset + header_size + length
+            if magic != SessionJournal.MAGIC or end > len(content):
+                break
+            payload = content[offset + header_size:end]
+            if zlib.crc32(payload) != crc:
+                break
+            try:
+                records.append(json.loads(payload))
+            except ValueError:
+                break
+            offset = end
+        return records, offset
+
+    @staticmethod
+    def recover(session_dir):
+        # Historia sprzed punktu kontrolnego jest już w CSV (FlightLoader),
+        # dekodujemy tylko końcówkę dziennika zapisaną po nim.
+        # Zwraca (liczba rekordów do punktu kontrolnego, rekordy końcówki).
+        logger = logging.getLogger('Lazarus_Ground_Station.session_journal')
+        journal_path = os.path.join(session_dir, SessionJournal.JOURNAL_NAME)
+        state = SessionJournal.read_checkpoint(session_dir) or {}
+
+        with open(journal_path, 'r+b') as f:
+            size = f.seek(0, os.SEEK_END)
+            checkpoint_offset = min(state.get('offset', 0), size)
+            if checkpoint_offset == 0:
+                # Bez punktu kontrolnego liczba rekordów jest nieznana
+                state['records'] = 0
+            f.seek(checkpoint_offset)
+            tail, length = SessionJournal.decode_frames(f.read())
+
+            end = checkpoint_offset + length
+            if end < size:
+                logger.warning(
+                    f"Obcięto uszkodzoną końcówkę dziennika: "
+                    f"{size - end} bajtów")
+                f.truncate(end)
+
+        records = state.get('records', 0)
+        logger.info(
+            f"Dziennik sesji: {records} rekordów do punktu kontrolnego, "
+            f"odczytano {len(tail)} rekordów z końcówki ({length} bajtów)")
+        return records, tail
@@ -0,0 +1,94 @@
+import logging
+import numpy as np
+from multiprocessing import shared_memory
+
+
+class SharedRing:
+    # Układ pamięci: [licznik zapisów u64][stan połączenia u64]
+    # [numery sekwencji slotów u64 * N][wartości f64 * N * liczba pól].
+    # Jeden producent, jeden konsument.
+    HEADER_SIZE = 16
+
+    def __init__(self, fields, capacity=1024, name=None, create=False):
+        self.logger = logging.getLogger('Lazarus_Ground_Station.shm_ring')
+        self.fields = list(fields)
+        self.capacity = capacity
+        width = len(self.fields)
+        size = (self.HEADER_SIZE + 8 * capacity
+                + 8 * capacity * width)
+
+        if create:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            try:
+                # Tylko proces tworzący zarządza czasem życia segmentu
+                self.shm = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:
+                self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.owner = create
+
+        buf = self.shm.buf
+        self.write_count = np.ndarray((1,), dtype=np.uint64, buffer=buf)
+        self.connection = np.ndarray((1,), dtype=np.uint64, buffer=buf,
+                                     offset=8)
+        self.sequences = np.ndarray((capacity,), dtype=np.uint64,
+                                    buffer=buf, offset=self.HEADER_SIZE)
+        self.values = np.ndarray((capacity, width), dtype=np.float64,
+                                 buffer=buf,
+                                 offset=self.HEADER_SIZE + 8 * capacity)
+        if create:
+            self.write_count[0] = 0
+            self.connection[0] = 0
+            self.sequences[:] = 0
+
+        self.read_count = int(self.write_count[0])
+        self.lost = 0
+
+    def write(self, data):
+        count = int(self.write_count[0])
+        slot = count % self.capacity
+        # Sekwencja 0 oznacza slot w trakcie zapisu
+        self.sequences[slot] = 0
+        self.values[slot] = [data.get(name, np.nan) for name in self.fields]
+        self.sequences[slot] = count + 1
+        self.write_count[0] = count + 1
+
+    def read_new(self):
+        count = int(self.write_count[0])
+        if count - self.read_count > self.capacity:
+            skipped = count - self.capacity - self.read_count
+            self.lost += skipped
+            self.logger.warning(
+                f"Konsument nie nadąża - pominięto {skipped} rekordów")
+            self.read_count = count - self.capacity
+
+        rows = []
+        for seq in range(self.read_count, count):
+            slot = seq % self.capacity
+            row = self.values[slot].copy()
+            if int(self.sequences[slot]) != seq + 1:
+                # Slot nadpisany podczas kopiowania
+                self.lost += 1
+                continue
+            rows.append(row)
+        self.read_count = count
+        return rows
+
+    def set_connected(self, connected):
+        # Licznik zmian * 2 + stan - konsument zauważa zmianę nawet wtedy,
+        # gdy stan końcowy jest taki sam jak przy poprzednim odczycie
+        changes = (int(self.connection[0]) >> 1) + 1
+        self.connection[0] = (changes << 1) | int(connected)
+
+    def connection_state(self):
+        return int(self.connection[0])
+
+    def close(self):
+        self.write_count = None
+        self.connection = None
+        self.sequences = None
+        self.values = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
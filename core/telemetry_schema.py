@@ -0,0 +1,145 @@
+import os
+import json
+import logging
+from core.flight_dynamics import FlightDynamics
+from core.packet_integrity import PacketIntegrity
+from core.utils import Utils
+
+
+class TelemetrySchema:
+    SCHEMA_FILE = 'telemetry_schema.json'
+    TYPES = {'float': float, 'int': int}
+    TRANSMISSION_FIELDS = [('len', 'int'), ('rssi', 'int'), ('snr', 'int')]
+
+    # Domyślny układ ramki - zgodny z dotychczasowym formatem rakiety
+    DEFAULT_FIELDS = [
+        {'name': 'velocity', 'type': 'float', 'unit': 'm/s',
+         'plot': True, 'title': 'Velocity', 'color': 'r', 'plot_order': 1},
+        {'name': 'pitch', 'type': 'float', 'unit': 'deg',
+         'plot': True, 'title': 'Pitch', 'color': 'y', 'plot_order': 2},
+        {'name': 'roll', 'type': 'float', 'unit': 'deg',
+         'plot': True, 'title': 'Roll', 'color': 'g', 'plot_order': 3},
+        {'name': 'status', 'type': 'int', 'unit': ''},
+        {'name': 'altitude', 'type': 'float', 'unit': 'm',
+         'plot': True, 'title': 'Altitude', 'color': 'b', 'plot_order': 0},
+        {'name': 'latitude', 'type': 'float', 'unit': 'deg'},
+        {'name': 'longitude', 'type': 'float', 'unit': 'deg'},
+    ]
+
+    # Pola odczytywane bezpośrednio przez FlightDynamics, MainWindow
+    # i FlightLoader - schemat bez nich jest odrzucany przy wczytywaniu
+    REQUIRED_FIELDS = ['altitude', 'velocity', 'latitude', 'longitude',
+                       'status', 'pitch', 'roll']
+    # Maska bitowa - musi pozostać liczbą całkowitą (bez skali)
+    INT_FIELDS = ['status']
+
+    current = None
+
+    def __init__(self, fields, require_integrity=False):
+        self.logger = logging.getLogger(
+            'Lazarus_Ground_Station.telemetry_schema')
+        self.fields = [self._normalize(i, field)
+                       for i, field in enumerate(fields)]
+        self.field_names = [f['name'] for f in self.fields]
+        if len(set(self.field_names)) != len(self.field_names):
+            raise ValueError(f"Powtórzone nazwy pól w schemacie: {self.field_names}")
+        self.field_count = len(self.fields)
+        self.require_integrity = bool(require_integrity)
+
+        self.record_fields = (self.field_names
+                              + PacketIntegrity.FIELDS
+                              + [name for name, _ in self.TRANSMISSION_FIELDS]
+                              + FlightDynamics.FIELDS)
+        self.csv_header = ['timestamp'] + self.record_fields
+        # Pole całkowite ze skalą po przeliczeniu staje się zmiennoprzecinkowe
+        self.types = {f['name']: 'int' if f['type'] == 'int' and f['scale'] == 1.0 else 'float'
+                      for f in self.fields}
+        missing = [name for name in self.REQUIRED_FIELDS
+                   if name not in self.field_names]
+        if missing:
+            raise ValueError(f"Brak wymaganych pól w schemacie: {missing}")
+        for name in self.INT_FIELDS:
+            if self.types[name] != 'int':
+                raise ValueError(f"Pole {name} musi być typu int bez skali")
+        self.types.update(dict(self.TRANSMISSION_FIELDS))
+        self.types.update({name: 'int' for name in PacketIntegrity.FIELDS})
+        self.plot_fields = sorted((f for f in self.fields if f['plot']),
+                                  key=lambda f: f['plot_order'])
+        self.parse = self._compile_parser()
+
+    @staticmethod
+    def _normalize(index, field):
+        name = field.get('name')
+        if not isinstance(name, str) or not name.isidentifier():
+            raise ValueError(f"Nieprawidłowa nazwa pola: {name!r}")
+        field_type = field.get('type', 'float')
+        if field_type not in TelemetrySchema.TYPES:
+            raise ValueError(f"Nieznany typ pola {name}: {field_type}")
+        return {
+            'name': name,
+            'type': field_type,
+            'unit': field.get('unit', ''),
+            'scale': float(field.get('scale', 1.0)),
+            'plot': bool(field.get('plot', False)),
+            'title': field.get('title', name),
+            'color': field.get('color', 'w'),
+            'plot_order': field.get('plot_order', index)
+        }
+
+    def _compile_parser(self):
+        # Schemat kompilowany jest raz do jednej funkcji budującej słownik,
+        # więc koszt na pakiet nie zależy od pętli po opisie pól
+        items = []
+        for i, field in enumerate(self.fields):
+            expr = f"{field['type']}(data[{i}])"
+            if field['scale'] != 1.0:
+                expr = f"{expr} * {field['scale']!r}"
+            items.append(f"{field['name']!r}: {expr}")
+        source = "def parse(data):\n    return {" + ", ".join(items) + "}\n"
+        namespace = {'float': float, 'int': int}
+        exec(source, namespace)
+        return namespace['parse']
+
+    def to_config(self):
+        return {'fields': self.fields, 'require_integrity': self.require_integrity}
+
+    def defaults(self):
+        values = {}
+        for name in self.record_fields:
+            values[name] = 0 if self.types.get(name) == 'int' else 0.0
+        return values
+
+    def is_int(self, name):
+        return self.types.get(name) == 'int'
+
+    def describe(self, telemetry):
+        return ", ".join(f"{name}={telemetry[name]}" for name in self.field_names)
+
+    @staticmethod
+    def load(path=None):
+        logger = logging.getLogger('Lazarus_Ground_Station.telemetry_schema')
+        if path is None:
+            path = os.getenv('LAZARUS_SCHEMA') or os.path.join(
+                Utils.get_appdata_path(), TelemetrySchema.SCHEMA_FILE)
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    config = json.load(f)
+                TelemetrySchema.current = TelemetrySchema(
+                    config['fields'], config.get('require_integrity', False))
+                logger.info(f"Wczytano schemat telemetrii: {path}")
+                return TelemetrySchema.current
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.error(f"Błąd wczytywania schematu {path}: {e} - używam domyślnego")
+        else:
+            logger.info("Brak pliku schematu telemetrii - używam domyślnego")
+
+        TelemetrySchema.current = TelemetrySchema(TelemetrySchema.DEFAULT_FIELDS)
+        return TelemetrySchema.current
+
+    @staticmethod
+    def get():
+        if TelemetrySchema.current is None:
+            TelemetrySchema.current = TelemetrySchema(TelemetrySchema.DEFAULT_FIELDS)
+        return TelemetrySchema.current
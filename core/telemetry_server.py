@@ -0,0 +1,194 @@
+import json
+import socket
+import struct
+import logging
+import threading
+from collections import deque
+
+
+class _ClientConnection:
+    def __init__(self, sock, address, queue_size):
+        self.sock = sock
+        self.address = address
+        self.queue = deque(maxlen=queue_size)
+        self.condition = threading.Condition()
+        self.dropped = 0
+        self.running = True
+        self.thread = None
+
+    def push(self, payload):
+        with self.condition:
+            # deque z maxlen sam usuwa najstarszy element - wolny klient
+            # traci stare rekordy zamiast blokować odczyt
+            if len(self.queue) == self.queue.maxlen:
+                self.dropped += 1
+            self.queue.append(payload)
+            self.condition.notify()
+
+    def close(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class TelemetryServer:
+    def __init__(self, host="127.0.0.1", port=5760, queue_size=256,
+                 multicast_group=None, multicast_port=5761,
+                 multicast_ttl=1):
+        self.logger = logging.getLogger(
+            'Lazarus_Ground_Station.telemetry_server')
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.multicast_group = multicast_group
+        self.multicast_port = multicast_port
+        self.multicast_ttl = multicast_ttl
+
+        self.clients = []
+        self.clients_lock = threading.Lock()
+        self.server_socket = None
+        self.multicast_socket = None
+        self.accept_thread = None
+        self.running = False
+
+    def start(self):
+        if self.running:
+            self.logger.debug("start() wywołane, ale serwer już działa")
+            return
+
+        try:
+            self.server_socket = socket.socket(socket.AF_INET,
+                                               socket.SOCK_STREAM)
+            self.server_socket.setsockopt(socket.SOL_SOCKET,
+                                          socket.SO_REUSEADDR, 1)
+            self.server_socket.bind((self.host, self.port))
+            self.server_socket.listen(64)
+            self.server_socket.settimeout(0.5)
+        except OSError as e:
+            self.server_socket = None
+            self.logger.error(
+                f"Nie można uruchomić serwera telemetrii na "
+                f"{self.host}:{self.port}: {e}")
+            return
+
+        if self.multicast_group:
+            try:
+                self.multicast_socket = socket.socket(
+                    socket.AF_INET, socket.SOCK_DGRAM,
+                    socket.IPPROTO_UDP)
+                self.multicast_socket.setsockopt(
+                    socket.IPPROTO_IP, socket.IP_MULTICAST_TTL,
+                    struct.pack('b', self.multicast_ttl))
+                self.multicast_socket.setblocking(False)
+                self.logger.info(
+                    f"Multicast UDP włączony: "
+                    f"{self.multicast_group}:{self.multicast_port}")
+            except OSError as e:
+                self.multicast_socket = None
+                self.logger.error(f"Błąd konfiguracji multicastu: {e}")
+
+        self.running = True
+        self.accept_thread = threading.Thread(target=self._accept_loop)
+        self.accept_thread.daemon = True
+        self.accept_thread.start()
+        self.logger.info(
+            f"Serwer telemetrii nasłuchuje na {self.host}:{self.port}")
+
+    def stop(self):
+        self.running = False
+        if self.accept_thread and self.accept_thread.is_alive():
+            self.accept_thread.join(timeout=1.0)
+        if self.server_socket:
+            self.server_socket.close()
+            self.server_socket = None
+        if self.multicast_socket:
+            self.multicast_socket.close()
+            self.multicast_socket = None
+
+        with self.clients_lock:
+            clients = list(self.clients)
+            self.clients.clear()
+        for client in clients:
+            client.close()
+        self.logger.info("Serwer telemetrii zatrzymany")
+
+    def publish(self, data):
+        if not self.running:
+            return
+
+        try:
+            payload = (json.dumps(data, default=str) + "\n").encode('utf-8')
+        except (TypeError, ValueError) as e:
+            self.logger.error(f"Nie można zserializować rekordu: {e}")
+            return
+
+        with self.clients_lock:
+            clients = list(self.clients)
+        for client in clients:
+            client.push(payload)
+
+        if self.multicast_socket:
+            try:
+                self.multicast_socket.sendto(
+                    payload, (self.multicast_group, self.multicast_port))
+            except OSError as e:
+                self.logger.debug(f"Błąd wysyłania multicastu: {e}")
+
+    def client_count(self):
+        with self.clients_lock:
+            return len(self.clients)
+
+    def _accept_loop(self):
+        while self.running:
+            try:
+                sock, address = self.server_socket.accept()
+            except socket.timeout:
+                continue
+            except OSError as e:
+                if self.running:
+                    self.logger.error(f"Błąd akceptowania połączenia: {e}")
+                break
+
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            client = _ClientConnection(sock, address, self.queue_size)
+            client.thread = threading.Thread(target=self._client_loop,
+                                             args=(client,))
+            client.thread.daemon = True
+            with self.clients_lock:
+                self.clients.append(client)
+            client.thread.start()
+            self.logger.info(
+                f"Podłączono klienta {address[0]}:{address[1]} "
+                f"(klientów: {self.client_count()})")
+
+    def _client_loop(self, client):
+        while True:
+            with client.condition:
+                while client.running and not client.queue:
+                    client.condition.wait()
+                if not client.running:
+                    break
+                batch = b"".join(client.queue)
+                client.queue.clear()
+
+            try:
+                client.sock.sendall(batch)
+            except OSError as e:
+                self.logger.info(
+                    f"Rozłączono klienta {client.address[0]}:"
+                    f"{client.address[1]}: {e}")
+                break
+
+        with self.clients_lock:
+            if client in self.clients:
+                self.clients.remove(client)
+        if client.dropped:
+            self.logger.warning(
+                f"Klient {client.address[0]}:{client.address[1]} "
+                f"pominął {client.dropped} rekordów (zbyt wolny odbiór)")
+        client.close()
@@ -34,4 +34,21 @@ class Utils:
 
         os.makedirs(session_dir)
         Utils.session_path = session_dir
-        return session_dir
\ No newline at end of file
+        return session_dir
+
+    @staticmethod
+    def latest_session_directory():
+        base_dir = Utils.get_appdata_path()
+        base_name = "session"
+        counter = 1
+        latest = None
+        while os.path.exists(os.path.join(base_dir,
+                                          f"{base_name}_{counter}")):
+            latest = os.path.join(base_dir, f"{base_name}_{counter}")
+            counter += 1
+        return latest
+
+    @staticmethod
+    def use_session_directory(session_dir):
+        Utils.session_path = session_dir
+        return session_dir
@@ -1,30 +1,90 @@
+import time
 import logging
 import pyqtgraph as pg
 pg.setConfigOptions(useOpenGL=True)
-from PyQt5.QtWidgets import QWidget, QVBoxLayout
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QComboBox
+from PyQt5.QtCore import QTimer
+from core.history_store import HistoryStore
 
 class LivePlot(QWidget):
-    def __init__(self, title="Wykres", max_points=100, color='y'):
+    # Zakres widoku w sekundach, None = cały lot
+    SPANS = {
+        "Ostatnie 5 s": 5.0,
+        "Ostatnie 30 s": 30.0,
+        "Ostatnie 5 min": 300.0,
+        "Cały lot": None
+    }
+    # Wykres przerysowywany najwyżej raz na REDRAW_MS, niezależnie od
+    # częstotliwości pakietów
+    REDRAW_MS = 50
+
+    def __init__(self, title="Wykres", raw_points=2000, color='y'):
         super().__init__()
         self.logger = logging.getLogger('Lazarus_Ground_Station.live_plot')
-        self.max_points = max_points
-        self.data = []
+        self.store = HistoryStore(raw_capacity=raw_points)
+        self.span = self.SPANS["Ostatnie 30 s"]
+        self.redraw_pending = False
 
-        self.logger.info(f"Tworzenie wykresu: tytuł='{title}', max_points={max_points}, kolor='{color}'")
+        self.logger.info(f"Tworzenie wykresu: tytuł='{title}', raw_points={raw_points}, kolor='{color}'")
 
         self.plot_widget = pg.PlotWidget(title=title)
         self.plot_widget.showGrid(x=True, y=True)
+        self.plot_widget.setLabel('bottom', 't', units='s')
         pen = pg.mkPen(color=color, width=2)
+        envelope_pen = pg.mkPen(color=color, width=1, style=pg.QtCore.Qt.DotLine)
         self.curve = self.plot_widget.plot(pen=pen)
+        self.min_curve = self.plot_widget.plot(pen=envelope_pen)
+        self.max_curve = self.plot_widget.plot(pen=envelope_pen)
+
+        self.span_combo = QComboBox()
+        self.span_combo.addItems(list(self.SPANS))
+        self.span_combo.setCurrentText("Ostatnie 30 s")
+        self.span_combo.currentTextChanged.connect(self.set_span)
 
         layout = QVBoxLayout()
+        layout.addWidget(self.span_combo)
         layout.addWidget(self.plot_widget)
         self.setLayout(layout)
 
-    def update_plot(self, new_value: float):
+    def set_span(self, text):
+        self.span = self.SPANS[text]
+        self.logger.debug(f"Zmieniono zakres wykresu: {text}")
+        self.redraw()
+
+    def update_plot(self, new_value: float, t=None):
         self.logger.debug(f"Nowa wartość dodana do wykresu: {new_value}")
-        self.data.append(new_value)
-        if len(self.data) > self.max_points:
-            removed = self.data.pop(0)
-            self.logger.debug(f"Usunięto najstarszy punkt: {removed}")
-        self.curve.setData(self.data)
+        self.store.append(time.time() if t is None else t, new_value)
+        if not self.redraw_pending:
+            self.redraw_pending = True
+            QTimer.singleShot(self.REDRAW_MS, self._redraw_pending)
+
+    def _redraw_pending(self):
+        if self.redraw_pending:
+            self.redraw()
+
+    def redraw(self):
+        self.redraw_pending = False
+        t, mean, low, high = self.store.query(self.span)
+        if len(t):
+            t = t - self.store.first_t
+        self.curve.setData(t, mean)
+        if low is None:
+            self.min_curve.clear()
+            self.max_curve.clear()
+        else:
+            self.min_curve.setData(t, low)
+            self.max_curve.setData(t, high)
+
+    def set_history(self, values, times):
+        self.store.load(times, values)
+        self.redraw()
+
+    def show_overview(self, values, times):
+        # Cała historia w jednym wektorowym przebiegu - bez przechodzenia
+        # przez update_plot pakiet po pakiecie
+        self.logger.debug(f"Widok całego lotu: {len(values)} punktów")
+        self.span_combo.blockSignals(True)
+        self.span_combo.setCurrentText("Cały lot")
+        self.span_combo.blockSignals(False)
+        self.span = None
+        self.set_history(values, times)
@@ -6,6 +6,16 @@ from gui.live_plot import LivePlot
 from datetime import datetime
 from core.process_data import ProcessData
 from core.csv_handler import CsvHandler
+from core.telemetry_schema import TelemetrySchema
+from core.session_journal import SessionJournal
+from core.flight_loader import FlightLoader
+from core.ingest_worker import IngestProcess
+from core.port_watcher import PortWatcher
+from core.profiler import SamplingProfiler
+from core.telemetry_server import TelemetryServer
+from core.playback import PlaybackController
+from gui.playback_bar import PlaybackBar
+import numpy as np
 
 class MainWindow(QMainWindow):
     def __init__(self, config):
@@ -23,47 +33,94 @@ class MainWindow(QMainWindow):
 
         self.engine_detection = False
 
-        self.current_data = {
-            'velocity': 0.0,
-            'altitude': 0.0,
-            'pitch': 0.0,
-            'roll': 0.0,
-            'status': 0,
-            'latitude': 0.0,
-            'longitude': 0.0,
-            'len': 0,
-            'rssi': 0,
-            'snr': 0
-        }
-
-        self.csv_handler = CsvHandler()
-        self.logger.info(
-            f"CSV handler zainicjalizowany w sesji: {self.csv_handler.session_dir}")
+        self.schema = TelemetrySchema.get()
+        # Nagrania sprzed dodania pól (np. wielkości pochodnych) uzupełniane
+        # są wartościami domyślnymi
+        self.defaults = self.schema.defaults()
+        self.current_data = dict(self.defaults)
 
         self.signal_quality = "None"
 
         self.setWindowTitle("LoRa Telemetry")
         self.setStyleSheet("background-color: black; color: white;")
 
-        self.serial = SerialReader(config['port'], config['baudrate'])
-        self.logger.info(f"SerialReader zainicjalizowany na porcie {config['port']} z baudrate {config['baudrate']}")
-        self.processor = ProcessData()
-        self.logger.info(
-            f"Singleton ProcessData zainicjalizowany")
-
-        if config['lora_config']:
-            self.serial.LoraSet(config['lora_config'], config['is_config_selected'])
-            self.logger.info(f"Konfiguracja LoRa ustawiona: {config['lora_config']}")
-
-        self.serial.telemetry_received.connect(self.processor.handle_telemetry)
-        self.serial.transmission_info_received.connect(self.processor.handle_transmission_info)
-        self.processor.processed_data_ready.connect(self.handle_processed_data)
+        self.csv_handler = None
+        self.journal = None
+        self.serial = None
+        self.playback = None
+        self.ingest = None
+        self.telemetry_server = None
+        server_config = config.get('telemetry_server')
+        if server_config:
+            self.telemetry_server = TelemetryServer(**server_config)
+            self.telemetry_server.start()
+
+        resumed_records = config.get('resumed_records', 0)
+        recovered_data = config.get('recovered_data')
+        dynamics_state = None
+        if recovered_data is not None:
+            dynamics_state = FlightLoader.dynamics_state(recovered_data)
+        if config.get('playback_path'):
+            # Tryb odtwarzania - dane z zapisanej sesji zamiast portu szeregowego
+            self.playback = PlaybackController(config['playback_path'])
+            self.setWindowTitle(f"LoRa Telemetry - odtwarzanie: {config['playback_path']}")
+            self.playback.record_ready.connect(self.handle_processed_data)
+            self.playback.seeked.connect(self.handle_seek)
+            self.playback.state_changed.connect(self.handle_playback_state)
+            if self.telemetry_server:
+                self.playback.record_ready.connect(self.telemetry_server.publish)
+        elif config.get('multiprocess'):
+            # Odczyt, dekodowanie i zapis w osobnym procesie - GUI dostaje
+            # gotowe rekordy przez bufor w pamięci współdzielonej
+            self.ingest = IngestProcess(config, resumed_records=resumed_records,
+                                        dynamics_state=dynamics_state)
+            self.ingest.processed_data_ready.connect(self.handle_processed_data)
+            self.ingest.connection_changed.connect(self.handle_connection_changed)
+            self.ingest.worker_exited.connect(self.handle_worker_exited)
+            if self.telemetry_server:
+                self.ingest.processed_data_ready.connect(self.telemetry_server.publish)
+        else:
+            self.csv_handler = CsvHandler(resume=resumed_records > 0)
+            self.logger.info(
+                f"CSV handler zainicjalizowany w sesji: {self.csv_handler.session_dir}")
+            self.journal = SessionJournal(self.csv_handler.session_dir)
+            self.journal.open(records=resumed_records)
+
+            self.serial = SerialReader(config['port'], config['baudrate'],
+                                       config.get('port_identity'), PortWatcher.instance())
+            self.logger.info(f"SerialReader zainicjalizowany na porcie {config['port']} z baudrate {config['baudrate']}")
+            self.processor = ProcessData()
+            if dynamics_state:
+                self.processor.dynamics.restore(dynamics_state)
+            self.logger.info(
+                f"Singleton ProcessData zainicjalizowany")
+
+            if config['lora_config']:
+                self.serial.LoraSet(config['lora_config'], config['is_config_selected'])
+                self.logger.info(f"Konfiguracja LoRa ustawiona: {config['lora_config']}")
+
+            self.serial.telemetry_received.connect(self.processor.handle_telemetry)
+            self.serial.transmission_info_received.connect(self.processor.handle_transmission_info)
+            self.serial.connection_changed.connect(self.handle_connection_changed)
+            self.processor.processed_data_ready.connect(self.handle_processed_data)
+            if self.telemetry_server:
+                self.processor.processed_data_ready.connect(self.telemetry_server.publish)
 
         # Wykresy
-        self.alt_plot = LivePlot(title="Altitude", color='b')
-        self.velocity_plot = LivePlot(title="Velocity", color='r')
-        self.pitch_plot = LivePlot(title="Pitch", color='y')
-        self.roll_plot = LivePlot(title="Roll", color='g')
+        self.plots = {}
+        for field in self.schema.plot_fields:
+            title = field['title']
+            if field['unit']:
+                title = f"{title} [{field['unit']}]"
+            self.plots[field['name']] = LivePlot(title=title, color=field['color'])
+        # Sesje nagrane przed dodaniem pola do schematu nie mają jego
+        # kolumny - takie wykresy pozostają puste
+        self.missing_plots = set()
+        if self.playback:
+            self.missing_plots = set(self.plots) - set(self.playback.fields)
+        plot_widgets = list(self.plots.values())
+        top_plots = plot_widgets[:(len(plot_widgets) + 1) // 2]
+        bottom_plots = plot_widgets[len(top_plots):]
 
         # Konsola
         self.console = QTextEdit()
@@ -77,6 +134,12 @@ class MainWindow(QMainWindow):
         self.label_pos = QLabel("Pos: --  --  ")
         self.label_pos.setStyleSheet("color: white; font-size: 18px;")
 
+        self.label_derived = QLabel("Vz: -- m/s, a: -- m/s²\nHmax: -- m\nDist: -- m, Az: --°")
+        self.label_derived.setStyleSheet("color: white; font-size: 14px;")
+
+        self.label_integrity = QLabel("Ramki: błędne 0, dupl. 0\npoza kolejn. 0, brak 0")
+        self.label_integrity.setStyleSheet("color: white; font-size: 12px;")
+
         # Przyciski
         self.start_button = QPushButton("Start")
         self.apogee_button = QPushButton("Apogee")
@@ -85,11 +148,13 @@ class MainWindow(QMainWindow):
         self.engine_button = QPushButton("Engine: Off")
         self.recovery_button = QPushButton("Recovery: Off")
         self.signal_button = QPushButton("Signal: None")
+        self.profiler_button = QPushButton("Profiler: Off")
+        self.profiler_button.clicked.connect(self.toggle_profiler)
 
         buttons = [
             self.start_button, self.apogee_button, self.landing_button,
             self.calib_button, self.engine_button, self.recovery_button,
-            self.signal_button
+            self.signal_button, self.profiler_button
         ]
 
         for btn in buttons:
@@ -99,8 +164,8 @@ class MainWindow(QMainWindow):
         main_layout = QVBoxLayout()
 
         top_row = QHBoxLayout()
-        top_row.addWidget(self.alt_plot)
-        top_row.addWidget(self.velocity_plot)
+        for plot in top_plots:
+            top_row.addWidget(plot)
 
         status_panel = QVBoxLayout()
         status_panel.addWidget(self.label_info)
@@ -114,14 +179,17 @@ class MainWindow(QMainWindow):
         top_row.addWidget(status_panel_widget)
 
         bottom_row = QHBoxLayout()
-        bottom_row.addWidget(self.pitch_plot)
-        bottom_row.addWidget(self.roll_plot)
+        for plot in bottom_plots:
+            bottom_row.addWidget(plot)
 
         engine_panel = QVBoxLayout()
         engine_panel.addWidget(self.calib_button)
         engine_panel.addWidget(self.engine_button)
         engine_panel.addWidget(self.recovery_button)
         engine_panel.addWidget(self.signal_button)
+        engine_panel.addWidget(self.profiler_button)
+        engine_panel.addWidget(self.label_derived)
+        engine_panel.addWidget(self.label_integrity)
         engine_panel_widget = QWidget()
         engine_panel_widget.setLayout(engine_panel)
         engine_panel_widget.setFixedWidth(210)
@@ -131,10 +199,30 @@ class MainWindow(QMainWindow):
         main_layout.addLayout(bottom_row)
         main_layout.addWidget(self.console)
 
+        if self.playback:
+            self.playback_bar = PlaybackBar(self.playback)
+            self.playback_bar.overview_button.clicked.connect(self.show_overview)
+            main_layout.addWidget(self.playback_bar)
+
         central.setLayout(main_layout)
         self.setCentralWidget(central)
 
-        self.serial.start_reading()
+        self.profiler = SamplingProfiler()
+        if SamplingProfiler.enabled_by_env():
+            self.toggle_profiler()
+
+        if self.playback:
+            self.show_overview()
+            self.console.append(
+                f"Odtwarzanie sesji: {self.playback.csv_path} "
+                f"({len(self.playback.data)} rekordów, {self.playback.duration:.1f} s)")
+        else:
+            if recovered_data is not None and len(recovered_data):
+                self.restore_records(recovered_data)
+            if self.ingest:
+                self.ingest.start()
+            else:
+                self.serial.start_reading()
 
         # self.timer = QTimer()
         # self.timer.timeout.connect(self.update_data)
@@ -144,34 +232,121 @@ class MainWindow(QMainWindow):
     def handle_processed_data(self, data):
         self.logger.debug(
             f"Odebrano dane przetworzone: {data}")
-        self.current_data = data
+        self.current_data = {**self.defaults, **data}
         try:
             self.update_data()
-            self.csv_handler.write_row(data)
+            if self.csv_handler:
+                self.csv_handler.write_row(data)
+            if self.journal:
+                self.journal.append(data)
         except Exception as e:
             self.logger.exception(
                 f"Błąd w update_data(): {e}")
 
+    def toggle_profiler(self):
+        self.now_str = datetime.now().strftime("%H:%M:%S")
+        if self.profiler.running:
+            path = self.profiler.stop()
+            self.profiler_button.setText("Profiler: Off")
+            self.profiler_button.setStyleSheet(
+                "QPushButton {border: 2px solid white; border-radius: 5px; background-color: black; color: red; padding: 5px;}")
+            self.console.append(f"{self.now_str} | PROFILER ZATRZYMANY - wynik: {path}")
+        else:
+            self.profiler.start()
+            self.profiler_button.setText("Profiler: On")
+            self.profiler_button.setStyleSheet(
+                "QPushButton {border: 2px solid white; border-radius: 5px; background-color: black; color: green; padding: 5px;}")
+            self.console.append(f"{self.now_str} | PROFILER URUCHOMIONY")
+
+    def handle_connection_changed(self, connected):
+        self.now_str = datetime.now().strftime("%H:%M:%S")
+        if connected:
+            # W trybie wieloprocesowym - port z konfiguracji (ewentualna
+            # nowa nazwa urządzenia jest w worker_events.log)
+            port = self.serial.port if self.serial else self.ingest.port
+            self.console.append(f"{self.now_str} | PONOWNIE POŁĄCZONO Z PORTEM {port}")
+        else:
+            self.console.append(f"{self.now_str} | UTRACONO POŁĄCZENIE Z PORTEM - trwa ponowne łączenie")
+
+    def handle_worker_exited(self, exitcode):
+        self.now_str = datetime.now().strftime("%H:%M:%S")
+        self.console.append(
+            f"{self.now_str} | PROCES ODCZYTU ZAKOŃCZYŁ SIĘ NIEOCZEKIWANIE (kod {exitcode}) - "
+            f"dane nie są odbierane, szczegóły w worker_events.log")
+
+    def restore_records(self, data):
+        # Czas wykresów na żywo to time.time() - historia w tej samej skali
+        start = data['timestamp'][0].astype(datetime).timestamp()
+        times = start + FlightLoader.elapsed_seconds(data)
+        self.load_plot_history(data, times)
+        self.reset_status(int(np.bitwise_or.reduce(data['status'])))
+        last = data[-1]
+        self.current_data = {**self.current_data,
+                             **{name: last[name].item() for name in data.dtype.names
+                                if name != 'timestamp'}}
+        self.console.append(
+            f"{datetime.now().strftime('%H:%M:%S')} | WZNOWIONO SESJĘ - "
+            f"odtworzono {len(data)} rekordów")
+
+    def load_plot_history(self, data, times, overview=False):
+        for name, plot in self.plots.items():
+            load = plot.show_overview if overview else plot.set_history
+            if name in data.dtype.names:
+                load(data[name][:len(times)], times)
+            else:
+                load([], [])
+
+    def show_overview(self):
+        self.load_plot_history(self.playback.data, self.playback.times, overview=True)
+
+    def handle_playback_state(self, playing):
+        # Po widoku całego lotu wykresy wracają do bieżącej pozycji
+        if playing:
+            self.handle_seek(self.playback.index)
+
+    def handle_seek(self, index):
+        # Stan po skoku wyznaczany z tablic sesji, bez odtwarzania od początku
+        last = max(index - 1, 0)
+        self.load_plot_history(self.playback.data, self.playback.times[:last])
+        status = self.playback.column('status', index)
+        self.reset_status(int(np.bitwise_or.reduce(status)) if index else 0)
+        if index:
+            self.current_data = {**self.defaults, **self.playback.record(last)}
+            try:
+                self.update_data()
+            except Exception as e:
+                self.logger.exception(
+                    f"Błąd w update_data(): {e}")
+
+    def reset_status(self, status):
+        on_style = "QPushButton {border: 2px solid white; border-radius: 5px; background-color: black; color: green; padding: 5px;}"
+        off_style = "QPushButton {border: 2px solid white; border-radius: 5px; background-color: black; color: red; padding: 5px;}"
+        flags = [
+            (0, 'calib_detection', self.calib_button, "Calibration: On", "Calibration: Off"),
+            (1, 'start_detection', self.start_button, "Start", "Start"),
+            (2, 'engine_detection', self.engine_button, "Engine: On", "Engine: Off"),
+            (3, 'apogee_detection', self.apogee_button, "Apogee", "Apogee"),
+            (4, 'recovery_detection', self.recovery_button, "Recovery: On", "Recovery: Off"),
+            (5, 'landing_detection', self.landing_button, "Descent", "Descent"),
+        ]
+        for bit, flag, button, on_text, off_text in flags:
+            detected = (status & (1 << bit)) != 0
+            setattr(self, flag, detected)
+            button.setStyleSheet(on_style if detected else off_style)
+            button.setText(on_text if detected else off_text)
+
     def update_data(self):
-        self.alt_plot.update_plot(
-            self.current_data['altitude'])
-        self.velocity_plot.update_plot(
-            self.current_data['velocity'])
-        self.pitch_plot.update_plot(
-            self.current_data['pitch'])
-        self.roll_plot.update_plot(
-            self.current_data['roll'])
+        for name, plot in self.plots.items():
+            if name not in self.missing_plots:
+                plot.update_plot(self.current_data[name], self.current_data.get('elapsed'))
 
         self.console_update_counter += 1
         if self.console_update_counter >= 10:
             self.console_update_counter = 0
             self.now_str = datetime.now().strftime(
                 "%H:%M:%S")
-            msg = (
-                f"{self.current_data['velocity']};{self.current_data['altitude']};"
-                f"{self.current_data['pitch']};{self.current_data['roll']};"
-                f"{self.current_data['status']};{self.current_data['latitude']};"
-                f"{self.current_data['longitude']}")
+            msg = ";".join(
+                str(self.current_data.get(name, '')) for name in self.schema.field_names)
             self.console.append(
                 f"{self.now_str} | LEN: {self.current_data['len']} bajtów | "
                 f"RSSI: {self.current_data['rssi']} dBm | "
@@ -209,15 +384,15 @@ class MainWindow(QMainWindow):
                 "QPushButton {border: 2px solid white; border-radius: 5px; background-color: black; color: green; padding: 5px;}")
             self.now_str = datetime.now().strftime(
                 "%H:%M:%S")
-            self.engine_buttonn.setText(
+            self.engine_button.setText(
                 f"Engine: On")
             self.console.append(
                 f"{self.now_str} | WYKRYTO URUCHOMIENIE SILNIKÓW")
             self.logger.info("Detekcja uruchomienia silników")
             self.engine_detection = True
-        else:
-            self.engine_buttonn.setText(
-                f"Engine: On")
+        elif not self.engine_detection:
+            self.engine_button.setText(
+                f"Engine: Off")
             self.engine_button.setStyleSheet(
                 "QPushButton {border: 2px solid white; border-radius: 5px; background-color: black; color: red; padding: 5px;}")
         if ((self.current_data['status'] & (
@@ -240,8 +415,8 @@ class MainWindow(QMainWindow):
             self.console.append(
                 f"{self.now_str} | WYKRYTO LĄDOWANIE")
             self.logger.info("Detekcja lądowania")
-            self.landing_detection = True
-        else:
+            self.recovery_detection = True
+        elif not self.recovery_detection:
             self.recovery_button.setStyleSheet(
                 "QPushButton {border: 2px solid white; border-radius: 5px; background-color: black; color: red; padding: 5px;}")
             self.recovery_button.setText("Recovery: Off")
@@ -285,8 +460,32 @@ class MainWindow(QMainWindow):
         )
         self.label_pos.setText(
             f"Pos: {self.current_data['latitude']:.6f}  {self.current_data['longitude']:.6f}")
+        self.label_derived.setText(
+            f"Vz: {self.current_data['vertical_speed']:.1f} m/s, "
+            f"a: {self.current_data['vertical_acceleration']:.1f} m/s²\n"
+            f"Hmax: {self.current_data['max_altitude']:.1f} m "
+            f"(T+{self.current_data['apogee_time']:.1f} s)\n"
+            f"Dist: {self.current_data['distance']:.0f} m, "
+            f"Az: {self.current_data['bearing']:.0f}°")
+        self.label_integrity.setText(
+            f"Ramki: błędne {self.current_data.get('corrupt_frames', 0)}, "
+            f"dupl. {self.current_data.get('duplicate_frames', 0)}\n"
+            f"poza kolejn. {self.current_data.get('out_of_order_frames', 0)}, "
+            f"brak {self.current_data.get('missing_frames', 0)}")
 
     def closeEvent(self, event):
-        self.serial.stop_reading()
-        self.csv_handler.close_file()
+        self.profiler.stop()
+        if self.serial:
+            self.serial.stop_reading()
+        if self.ingest:
+            self.ingest.stop()
+        PortWatcher.instance().stop()
+        if self.playback:
+            self.playback.pause()
+        if self.telemetry_server:
+            self.telemetry_server.stop()
+        if self.csv_handler:
+            self.csv_handler.close_file()
+        if self.journal:
+            self.journal.close()
         super().closeEvent(event)
\ No newline at end of file
@@ -0,0 +1,78 @@
+import logging
+from PyQt5.QtWidgets import (QWidget, QHBoxLayout, QPushButton, QSlider,
+                             QLabel, QComboBox)
+from PyQt5.QtCore import Qt
+
+
+class PlaybackBar(QWidget):
+    SLIDER_RESOLUTION = 10  # kroki suwaka na sekundę
+    SPEEDS = ["0.25", "0.5", "1", "2", "4", "8", "16"]
+
+    def __init__(self, controller):
+        super().__init__()
+        self.logger = logging.getLogger('Lazarus_Ground_Station.playback_bar')
+        self.controller = controller
+        self.slider_pressed = False
+
+        button_style = "QPushButton {border: 2px solid white; border-radius: 5px; color: white; padding: 5px;}"
+
+        self.play_button = QPushButton("Odtwórz")
+        self.play_button.setStyleSheet(button_style)
+        self.play_button.clicked.connect(controller.toggle)
+
+        self.overview_button = QPushButton("Cały lot")
+        self.overview_button.setStyleSheet(button_style)
+
+        self.slider = QSlider(Qt.Horizontal)
+        self.slider.setRange(0, int(controller.duration * self.SLIDER_RESOLUTION))
+        self.slider.sliderPressed.connect(self._slider_pressed)
+        self.slider.sliderReleased.connect(self._slider_released)
+        self.slider.valueChanged.connect(self._slider_moved)
+
+        self.time_label = QLabel()
+        self.time_label.setStyleSheet("color: white; font-size: 14px;")
+        self.time_label.setFixedWidth(130)
+
+        self.speed_combo = QComboBox()
+        self.speed_combo.addItems([f"{s}x" for s in self.SPEEDS])
+        self.speed_combo.setCurrentText("1x")
+        self.speed_combo.currentTextChanged.connect(
+            lambda text: controller.set_speed(float(text[:-1])))
+
+        layout = QHBoxLayout()
+        layout.addWidget(self.play_button)
+        layout.addWidget(self.slider)
+        layout.addWidget(self.time_label)
+        layout.addWidget(self.speed_combo)
+        layout.addWidget(self.overview_button)
+        self.setLayout(layout)
+
+        controller.position_changed.connect(self.update_position)
+        controller.state_changed.connect(
+            lambda playing: self.play_button.setText("Pauza" if playing else "Odtwórz"))
+        self.update_position(0.0)
+
+    def update_position(self, position):
+        if not self.slider_pressed:
+            self.slider.blockSignals(True)
+            self.slider.setValue(int(position * self.SLIDER_RESOLUTION))
+            self.slider.blockSignals(False)
+        self.time_label.setText(
+            f"{self._format(position)} / {self._format(self.controller.duration)}")
+
+    def _slider_pressed(self):
+        self.slider_pressed = True
+
+    def _slider_released(self):
+        self.slider_pressed = False
+        self.controller.seek(self.slider.value() / self.SLIDER_RESOLUTION)
+
+    def _slider_moved(self, value):
+        # Kliknięcie w ścieżkę suwaka lub klawiatura - skok od razu
+        if not self.slider_pressed:
+            self.controller.seek(value / self.SLIDER_RESOLUTION)
+
+    @staticmethod
+    def _format(seconds):
+        minutes, seconds = divmod(int(seconds), 60)
+        return f"{minutes:02d}:{seconds:02d}"
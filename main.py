@@ -1,14 +1,47 @@
 import sys
 import logging
-from PyQt5.QtWidgets import (QApplication, QDialog)
+from PyQt5.QtWidgets import (QApplication, QDialog, QMessageBox)
 from gui.main_window import MainWindow
 from core.serial_config import SerialConfigDialog
 from core.utils import Utils
+from core.telemetry_schema import TelemetrySchema
+from core.session_journal import SessionJournal
+from core.flight_loader import FlightLoader
+from core.csv_handler import CsvHandler
 import os
+import multiprocessing
+
+def telemetry_server_config():
+    # LAZARUS_SERVER_PORT=0 wyłącza serwer, LAZARUS_MULTICAST=239.0.0.1
+    # dodatkowo rozsyła rekordy przez UDP multicast
+    port = int(os.getenv('LAZARUS_SERVER_PORT', '5760'))
+    if port == 0:
+        return None
+    return {
+        'host': os.getenv('LAZARUS_SERVER_HOST', '127.0.0.1'),
+        'port': port,
+        'multicast_group': os.getenv('LAZARUS_MULTICAST') or None
+    }
+
+def ask_resume_session(session_dir):
+    answer = QMessageBox.question(
+        None, "Przerwana sesja",
+        f"Poprzednia sesja ({os.path.basename(session_dir)}) nie została "
+        f"poprawnie zamknięta.\nCzy wznowić zapis w tej sesji?",
+        QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+    return answer == QMessageBox.Yes
 
 def main():
 
-    session_dir = Utils.create_session_directory()
+    app = QApplication(sys.argv)
+
+    previous_session = Utils.latest_session_directory()
+    resume = (SessionJournal.needs_recovery(previous_session)
+              and ask_resume_session(previous_session))
+    if resume:
+        session_dir = Utils.use_session_directory(previous_session)
+    else:
+        session_dir = Utils.create_session_directory()
     log_file = os.path.join(session_dir, 'app_events.log')
 
     logging.basicConfig(
@@ -23,16 +56,35 @@ def main():
     logger.info(f"Log file location: {log_file}")
     logger.info("Uruchamianie aplikacji")
 
-    app = QApplication(sys.argv)
+    schema = TelemetrySchema.load()
+    logger.info(f"Pola telemetrii: {schema.field_names}")
+
+    resumed_records = 0
+    recovered_data = None
+    if resume:
+        checkpoint_records, tail = SessionJournal.recover(session_dir)
+        resumed_records = checkpoint_records + len(tail)
+        CsvHandler.repair(resumed_records, tail)
+        try:
+            recovered_data = FlightLoader.load_session(session_dir)
+        except OSError as e:
+            logger.error(f"Nie można wczytać historii wznawianej sesji: {e}")
+        logger.info(f"Wznowiono sesję {session_dir}, rekordów w dzienniku: {resumed_records}")
 
     config_dialog = SerialConfigDialog()
     if config_dialog.exec_() == QDialog.Accepted:
         config = config_dialog.get_settings()
         logger.info(f"Konfiguracja portu załadowana: {config}")
     else:
-        config = {'port': "", 'baudrate': 9600, 'lora_config': None, 'is_config_selected': True}
+        config = {'port': "", 'port_identity': None, 'baudrate': 9600, 'lora_config': None, 'is_config_selected': True, 'playback_path': None, 'multiprocess': False}
         logger.info("Użytkownik zrezygnował z portu – używam domyślnych ustawień")
 
+    config['resumed_records'] = resumed_records
+    config['recovered_data'] = recovered_data
+    config['telemetry_server'] = telemetry_server_config()
+    if config['telemetry_server']:
+        logger.info(f"Serwer telemetrii włączony: {config['telemetry_server']}")
+
     window = MainWindow(config)
     window.resize(800, 600)
     window.show()
@@ -41,4 +93,5 @@ def main():
     sys.exit(exit_code)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file